@@ -0,0 +1,297 @@
+"""
+Tool catalog for the MCP Voitta Gateway.
+
+The catalog is an immutable view of the tools exposed by the gateway's
+upstreams, indexed for constant-time name resolution. Whenever the tool set
+changes a new catalog is built and swapped in as a whole, so request handlers
+always see a consistent set of tools.
+"""
+
+import base64
+import binascii
+import bisect
+import hashlib
+import json
+import logging
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import mcp.types as types
+
+from schema import SchemaNormalizer
+from validation import STRUCTURAL, compile_schema
+
+logger = logging.getLogger("mcp-voitta-gateway.catalog")
+
+# Delimiter used by Voitta between the namespace and the function name
+TOOL_DELIMITER = "____"
+
+
+class CatalogEntry:
+    """
+    A single Voitta tool as exposed through MCP.
+    """
+
+    __slots__ = (
+        "full_name", "name", "short_name", "namespace", "upstream", "description", "parameters", "input_schema",
+        "validator",
+    )
+
+    def __init__(
+        self,
+        full_name: str,
+        description: str,
+        parameters: Any,
+        upstream: str = "",
+        normalizer: Optional[SchemaNormalizer] = None,
+        validators: Optional[Dict[Tuple[int, str], Tuple[Any, Any]]] = None,
+        validation_mode: str = STRUCTURAL,
+    ):
+        """
+        Initialize a catalog entry.
+
+        Args:
+            full_name: The prefixed Voitta function name (e.g. ``1____search``).
+            description: The tool description.
+            parameters: The Voitta ``function.parameters`` block.
+            upstream: Name of the upstream that provides the tool.
+            normalizer: The catalog's schema normalizer.
+            validators: Validators already compiled for the catalog, by
+                schema identity and mode, with the schema kept alive alongside.
+            validation_mode: How thoroughly arguments are validated.
+        """
+        self.full_name = full_name
+        self.upstream = upstream
+        self.short_name = full_name.split(TOOL_DELIMITER)[-1]
+        self.namespace = full_name.split(TOOL_DELIMITER)[0] if TOOL_DELIMITER in full_name else ""
+        # Name exposed to MCP clients; replaced by the full name on collisions
+        self.name = self.short_name
+        self.description = description
+        self.parameters = parameters
+        # Normalized JSON Schema, shared with every tool that has the same parameters
+        self.input_schema = (normalizer or SchemaNormalizer()).normalize(parameters)
+        # Argument validator, compiled once per distinct schema in the catalog
+        key = (id(self.input_schema), validation_mode)
+        compiled = validators.get(key) if validators is not None else None
+        if compiled is None:
+            compiled = (self.input_schema, compile_schema(self.input_schema, validation_mode))
+            if validators is not None:
+                validators[key] = compiled
+        self.validator = compiled[1]
+
+
+class ToolCatalog:
+    """
+    Immutable, indexed snapshot of the tools provided by the upstreams.
+
+    Tools are exposed under their short name (the part after ``____``). When
+    two namespaces share a short name, the first tool keeps the short name and
+    the others are exposed under their full prefixed name. Full names always
+    resolve, so every tool stays reachable.
+    """
+
+    def __init__(
+        self,
+        voitta_tools: List[Dict[str, Any]],
+        previous: Optional["ToolCatalog"] = None,
+        validation_modes: Optional[Dict[str, str]] = None,
+    ):
+        """
+        Build the catalog and its name index.
+
+        Args:
+            voitta_tools: Tools in the format returned by ``VoittaRouter.get_tools()``,
+                optionally tagged with an ``upstream`` name.
+            previous: The catalog being replaced, whose normalized schemas are reused.
+            validation_modes: Argument validation mode by upstream name;
+                tools of other upstreams get structural validation.
+        """
+        self.voitta_tools = voitta_tools
+        # Holds only the schemas of this catalog's tools
+        self.normalizer = SchemaNormalizer(previous.normalizer if previous is not None else None)
+        self.entries: List[CatalogEntry] = []
+        self.collisions: Dict[str, List[str]] = {}
+        self._index: Dict[str, CatalogEntry] = {}
+        self._mcp_tools: Optional[List[types.Tool]] = None
+        self._slim_mcp_tools: Optional[Tuple[int, List[types.Tool]]] = None
+
+        # Content hash used to detect refreshes that change nothing
+        self.fingerprint = hashlib.sha256(
+            json.dumps(voitta_tools, sort_keys=True, default=str).encode("utf-8")
+        ).hexdigest()
+
+        by_short_name: Dict[str, CatalogEntry] = {}
+        # Shared by the entries while building, so the catalog holds one
+        # validator per distinct schema and releases them with its entries
+        validators: Dict[Tuple[int, str], Tuple[Any, Any]] = {}
+        for tool in voitta_tools:
+            function_info = tool.get("function", {})
+            full_name = function_info.get("name", "")
+            if not full_name or full_name in self._index:
+                continue
+
+            entry = CatalogEntry(
+                full_name,
+                function_info.get("description", ""),
+                function_info.get("parameters", {}),
+                tool.get("upstream", ""),
+                self.normalizer,
+                validators,
+                (validation_modes or {}).get(tool.get("upstream", ""), STRUCTURAL),
+            )
+
+            owner = by_short_name.get(entry.short_name)
+            if owner is None:
+                by_short_name[entry.short_name] = entry
+            else:
+                entry.name = entry.full_name
+                self.collisions.setdefault(entry.short_name, [owner.full_name]).append(entry.full_name)
+
+            self.entries.append(entry)
+            self._index[entry.full_name] = entry
+
+        for short_name, entry in by_short_name.items():
+            self._index.setdefault(short_name, entry)
+
+        # Keep the previous catalog's schemas from living as long as this one
+        self.normalizer.detach()
+
+        for short_name, full_names in self.collisions.items():
+            logger.warning(
+                f"Tool name collision for '{short_name}': {full_names}; "
+                f"'{short_name}' resolves to {full_names[0]}, others are exposed by full name"
+            )
+
+    @property
+    def mcp_tools(self) -> List[types.Tool]:
+        """
+        MCP Tool objects for every entry, converted on first use.
+
+        The list is cached for the lifetime of the catalog; building a new
+        catalog is what invalidates it.
+        """
+        if self._mcp_tools is None:
+            # Sorted by name so pages stay stable across requests and catalog swaps
+            self._mcp_tools = sorted(
+                (to_mcp_tool(entry) for entry in self.entries), key=lambda tool: tool.name
+            )
+            logger.info(f"Converted {len(self._mcp_tools)} tools for list_tools")
+        return self._mcp_tools
+
+    def slim_mcp_tools(self, description_length: int) -> List[types.Tool]:
+        """
+        Slim MCP Tool objects for every entry, sorted by name.
+
+        Args:
+            description_length: Maximum description length in characters.
+
+        Returns:
+            The slim tools; converted once per catalog and description length.
+        """
+        if self._slim_mcp_tools is None or self._slim_mcp_tools[0] != description_length:
+            tools = sorted(
+                (to_slim_mcp_tool(entry, description_length, self.normalizer) for entry in self.entries),
+                key=lambda tool: tool.name,
+            )
+            self._slim_mcp_tools = (description_length, tools)
+        return self._slim_mcp_tools[1]
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __iter__(self) -> Iterator[CatalogEntry]:
+        return iter(self.entries)
+
+    def resolve(self, name: str) -> Optional[CatalogEntry]:
+        """
+        Resolve an exposed, short or full tool name to its catalog entry.
+
+        Args:
+            name: The tool name sent by the client.
+
+        Returns:
+            The matching entry, or None if the name is unknown.
+        """
+        return self._index.get(name)
+
+
+def to_mcp_tool(entry: CatalogEntry) -> types.Tool:
+    """
+    Convert a catalog entry to an MCP Tool object.
+
+    Built without validation, which would copy the schema, so listed tools
+    share the catalog's interned schemas.
+
+    Args:
+        entry: The catalog entry to convert.
+
+    Returns:
+        The MCP Tool using the entry's normalized input schema.
+    """
+    return types.Tool.model_construct(
+        name=entry.name,
+        description=entry.description,
+        inputSchema=entry.input_schema
+    )
+
+
+def to_slim_mcp_tool(
+    entry: CatalogEntry, description_length: int, normalizer: Optional[SchemaNormalizer] = None
+) -> types.Tool:
+    """
+    Convert a catalog entry to an MCP Tool with a short description and minimal schema.
+
+    Args:
+        entry: The catalog entry to convert.
+        description_length: Maximum description length in characters.
+        normalizer: The catalog's schema normalizer, which shares minimal schemas.
+
+    Returns:
+        The slim MCP Tool.
+    """
+    description = entry.description or ""
+    if len(description) > description_length:
+        description = description[:description_length].rsplit(" ", 1)[0].rstrip() + "..."
+
+    return types.Tool.model_construct(
+        name=entry.name,
+        description=description,
+        inputSchema=(normalizer or SchemaNormalizer()).minimize(entry.input_schema)
+    )
+
+
+def list_page(tools: List[types.Tool], cursor: Optional[str], page_size: int) -> Tuple[List[types.Tool], Optional[str]]:
+    """
+    Return one page of a name-sorted tool list.
+
+    Cursors encode the name of the last tool on the previous page rather
+    than an offset, so a cursor issued before a catalog swap continues after
+    the same name in the new catalog.
+
+    Args:
+        tools: The tools to page through, sorted by name.
+        cursor: Cursor from the previous page, or None for the first page.
+        page_size: Maximum number of tools per page; 0 returns all tools.
+
+    Returns:
+        Tuple of the tools on this page and the cursor for the next page,
+        which is None on the last page.
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    start = 0
+    if cursor:
+        try:
+            last_name = base64.b64decode(cursor, altchars=b"-_", validate=True).decode("utf-8")
+        except (binascii.Error, UnicodeError, ValueError):
+            raise ValueError(f"Invalid cursor: {cursor}")
+        start = bisect.bisect_right(tools, last_name, key=lambda tool: tool.name)
+
+    if page_size <= 0:
+        return tools[start:], None
+
+    page = tools[start:start + page_size]
+    if start + page_size >= len(tools):
+        return page, None
+    next_cursor = base64.urlsafe_b64encode(page[-1].name.encode("utf-8")).decode("ascii")
+    return page, next_cursor
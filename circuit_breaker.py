@@ -0,0 +1,225 @@
+"""
+Circuit breakers for the MCP Voitta Gateway.
+
+A breaker watches the outcome of recent calls to an upstream. When too many
+of them fail or are slow it opens, and calls fail immediately instead of
+waiting on a service that is down. After a cool-down it lets a few probe
+calls through (half-open) and closes again once they succeed.
+"""
+
+import asyncio
+import contextlib
+import logging
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Iterator, Optional, Tuple
+
+logger = logging.getLogger("mcp-voitta-gateway.circuit_breaker")
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised when a call is rejected because the upstream's circuit is open."""
+
+
+class GuardedCall:
+    """Outcome of a call made under a breaker's guard."""
+
+    __slots__ = ("success",)
+
+    def __init__(self):
+        # Cleared by the caller when the call returned an error result
+        self.success = True
+
+
+class CircuitBreaker:
+    """
+    Rolling-window circuit breaker with half-open probing.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        settings: Dict[str, Any],
+        on_change: Optional[Callable[[str, str], None]] = None,
+    ):
+        """
+        Initialize a closed breaker.
+
+        Args:
+            name: What the breaker protects, for messages.
+            settings: The ``circuit_breaker`` configuration block.
+            on_change: Called with the old and new state on every transition.
+        """
+        self.name = name
+        self.settings = settings
+        self.window = float(settings.get("window", 60))
+        self.min_calls = int(settings.get("min_calls", 10))
+        self.failure_rate = float(settings.get("failure_rate", 0.5))
+        self.slow_call_threshold: Optional[float] = settings.get("slow_call_threshold")
+        self.slow_call_rate = float(settings.get("slow_call_rate", 0.5))
+        self.open_duration = float(settings.get("open_duration", 30))
+        self.half_open_calls = int(settings.get("half_open_calls", 1))
+        self.on_change = on_change
+
+        self.state = CLOSED
+        self.opened_at = 0.0
+        self.trips = 0
+        self.rejected = 0
+        # (time, failed, slow) of recent calls, oldest first
+        self._outcomes: Deque[Tuple[float, bool, bool]] = deque()
+        self._probes = 0
+        self._half_open_timer: Optional[asyncio.TimerHandle] = None
+
+    @property
+    def available(self) -> bool:
+        """Whether calls are currently let through, at least as probes."""
+        return self.state != OPEN
+
+    def check(self):
+        """
+        Fail fast if the circuit is open, without taking a probe slot.
+
+        Raises:
+            CircuitOpenError: If the circuit is open.
+        """
+        if self.state == OPEN:
+            self.acquire()
+
+    @contextlib.contextmanager
+    def guard(self) -> Iterator["GuardedCall"]:
+        """
+        Let a call through if the circuit allows it and record its outcome.
+
+        Exceptions count as failures, as do calls whose ``success`` the
+        caller clears on the yielded ``GuardedCall``. Cancelled calls are
+        not counted.
+
+        Raises:
+            CircuitOpenError: If the circuit is open or all probe slots are taken.
+        """
+        probe = self.acquire()
+        call = GuardedCall()
+        start = time.monotonic()
+        try:
+            yield call
+        except asyncio.CancelledError:
+            if probe:
+                self._probes -= 1
+            raise
+        except Exception:
+            self.record(False, time.monotonic() - start, probe)
+            raise
+        else:
+            self.record(call.success, time.monotonic() - start, probe)
+
+    def acquire(self) -> bool:
+        """
+        Check that a call may go through.
+
+        Returns:
+            True if the call is a half-open probe.
+
+        Raises:
+            CircuitOpenError: If the circuit is open or all probe slots are taken.
+        """
+        if self.state == CLOSED:
+            return False
+
+        if self.state == HALF_OPEN and self._probes < self.half_open_calls:
+            self._probes += 1
+            return True
+
+        self.rejected += 1
+        retry_in = max(0.0, self.opened_at + self.open_duration - time.monotonic())
+        raise CircuitOpenError(f"{self.name} is unavailable (circuit {self.state}, retry in {retry_in:.0f}s)")
+
+    def record(self, success: bool, latency: float, probe: bool = False):
+        """
+        Record the outcome of a call.
+
+        Args:
+            success: Whether the call succeeded.
+            latency: Seconds the call took.
+            probe: Whether the call was a half-open probe.
+        """
+        slow = self.slow_call_threshold is not None and latency >= self.slow_call_threshold
+        if probe:
+            self._probes -= 1
+
+        if self.state == HALF_OPEN:
+            if not success or slow:
+                self._open()
+            elif probe:
+                self._transition(CLOSED)
+                self._outcomes.clear()
+            return
+        if self.state == OPEN:
+            return
+
+        now = time.monotonic()
+        self._outcomes.append((now, not success, slow))
+        while self._outcomes and self._outcomes[0][0] < now - self.window:
+            self._outcomes.popleft()
+
+        calls = len(self._outcomes)
+        if calls < self.min_calls:
+            return
+        failures = sum(1 for _, failed, _ in self._outcomes if failed)
+        slow_calls = sum(1 for _, _, was_slow in self._outcomes if was_slow)
+        if failures / calls >= self.failure_rate or (
+            self.slow_call_threshold is not None and slow_calls / calls >= self.slow_call_rate
+        ):
+            logger.warning(
+                f"{self.name}: {failures} failed and {slow_calls} slow of the last {calls} calls"
+            )
+            self._open()
+
+    def _open(self):
+        self.opened_at = time.monotonic()
+        self.trips += 1
+        self._outcomes.clear()
+        self._transition(OPEN)
+
+        # Move to half-open on a timer, so listed tools reappear and can be probed
+        if self._half_open_timer is not None:
+            self._half_open_timer.cancel()
+        self._half_open_timer = asyncio.get_running_loop().call_later(self.open_duration, self._half_open)
+
+    def _half_open(self):
+        self._half_open_timer = None
+        if self.state == OPEN:
+            self._probes = 0
+            self._transition(HALF_OPEN)
+
+    def _transition(self, state: str):
+        previous, self.state = self.state, state
+        logger.warning(f"Circuit of {self.name} changed from {previous} to {state}")
+        if self.on_change is not None:
+            self.on_change(previous, state)
+
+    def close(self):
+        """Stop the half-open timer of a breaker that is no longer used."""
+        if self._half_open_timer is not None:
+            self._half_open_timer.cancel()
+            self._half_open_timer = None
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Report the breaker's state and statistics.
+
+        Returns:
+            Dictionary with the state, recent failure and slow call counts,
+            the number of trips and of rejected calls.
+        """
+        return {
+            "state": self.state,
+            "recent_calls": len(self._outcomes),
+            "recent_failures": sum(1 for _, failed, _ in self._outcomes if failed),
+            "recent_slow_calls": sum(1 for _, _, slow in self._outcomes if slow),
+            "trips": self.trips,
+            "rejected": self.rejected,
+        }
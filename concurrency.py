@@ -0,0 +1,168 @@
+"""
+Concurrency limits for the MCP Voitta Gateway.
+
+A limiter caps how many calls run at once against an upstream or a tool.
+Calls over the limit wait in a bounded queue for up to a timeout; calls that
+find the queue full or time out are rejected rather than piling up on an
+overloaded service.
+"""
+
+import asyncio
+import contextlib
+import logging
+import time
+from typing import Any, AsyncIterator, Dict, Optional
+
+logger = logging.getLogger("mcp-voitta-gateway.concurrency")
+
+
+class OverloadedError(RuntimeError):
+    """Raised when a call is rejected because a concurrency limit is saturated."""
+
+
+class ConcurrencyLimiter:
+    """
+    Semaphore with a bounded, time-limited wait queue and usage statistics.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_concurrent: int,
+        max_queue: Optional[int] = None,
+        queue_timeout: Optional[float] = None,
+    ):
+        """
+        Initialize a limiter.
+
+        Args:
+            name: What the limiter protects, for messages and statistics.
+            max_concurrent: Maximum number of calls running at once.
+            max_queue: Maximum number of calls waiting for a slot, or None for no limit.
+            queue_timeout: Seconds a call may wait for a slot, or None to wait indefinitely.
+        """
+        self.name = name
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+
+        self.active = 0
+        self.waiting = 0
+        self.peak_waiting = 0
+        self.acquired = 0
+        self.queued = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    @classmethod
+    def from_settings(cls, name: str, settings: Dict[str, Any]) -> Optional["ConcurrencyLimiter"]:
+        """
+        Create a limiter from a ``concurrency`` configuration block.
+
+        Args:
+            name: What the limiter protects.
+            settings: Mapping with ``max_concurrent`` and optional
+                ``max_queue`` and ``queue_timeout``.
+
+        Returns:
+            The limiter, or None if ``max_concurrent`` is not set.
+        """
+        max_concurrent = settings.get("max_concurrent")
+        if not max_concurrent:
+            return None
+        return cls(name, int(max_concurrent), settings.get("max_queue"), settings.get("queue_timeout"))
+
+    def matches(self, settings: Dict[str, Any]) -> bool:
+        """
+        Test whether the limiter was created from equivalent settings.
+
+        Args:
+            settings: A ``concurrency`` configuration block.
+
+        Returns:
+            True if the limits are the same.
+        """
+        return (
+            self.max_concurrent == settings.get("max_concurrent")
+            and self.max_queue == settings.get("max_queue")
+            and self.queue_timeout == settings.get("queue_timeout")
+        )
+
+    @contextlib.asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """
+        Hold a slot for the duration of a call.
+
+        Raises:
+            OverloadedError: If the queue is full or the wait timed out.
+        """
+        await self.acquire()
+        try:
+            yield
+        finally:
+            self.release()
+
+    async def acquire(self):
+        """
+        Take a slot, waiting in the queue if none is free.
+
+        Raises:
+            OverloadedError: If the queue is full or the wait timed out.
+        """
+        if self._semaphore.locked():
+            if self.max_queue is not None and self.waiting >= self.max_queue:
+                self.rejected += 1
+                raise OverloadedError(
+                    f"{self.name} is overloaded: {self.active} calls running and {self.waiting} queued"
+                )
+
+            self.waiting += 1
+            self.queued += 1
+            self.peak_waiting = max(self.peak_waiting, self.waiting)
+            start = time.monotonic()
+            try:
+                await asyncio.wait_for(self._semaphore.acquire(), self.queue_timeout)
+            except asyncio.TimeoutError:
+                self.timed_out += 1
+                raise OverloadedError(
+                    f"{self.name} is overloaded: no free slot within {self.queue_timeout}s"
+                ) from None
+            finally:
+                self.waiting -= 1
+                waited = time.monotonic() - start
+                self.total_wait += waited
+                self.max_wait = max(self.max_wait, waited)
+        else:
+            await self._semaphore.acquire()
+
+        self.active += 1
+        self.acquired += 1
+
+    def release(self):
+        """Give back a slot."""
+        self.active -= 1
+        self._semaphore.release()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Report the limiter's current state and statistics.
+
+        Returns:
+            Dictionary with the limits, running and queued calls, queue
+            peaks, rejections and wait times.
+        """
+        return {
+            "max_concurrent": self.max_concurrent,
+            "active": self.active,
+            "waiting": self.waiting,
+            "peak_waiting": self.peak_waiting,
+            "acquired": self.acquired,
+            "queued": self.queued,
+            "rejected": self.rejected,
+            "timed_out": self.timed_out,
+            "average_wait": self.total_wait / self.queued if self.queued else 0.0,
+            "max_wait": self.max_wait,
+        }
@@ -0,0 +1,434 @@
+"""
+Configuration loading for the MCP Voitta Gateway.
+
+The gateway reads the same YAML file as Voitta. Gateway-specific options
+live under a top-level ``gateway`` key, which is removed before the remaining
+configuration is handed to the VoittaRouter.
+
+Several configuration files can be federated behind one gateway. Each gets a
+namespace that prefixes its tools; gateway-wide options are taken from the
+first file.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import re
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import yaml
+from voitta import VoittaRouter
+
+from catalog import TOOL_DELIMITER
+from tool_filter import ToolFilter, ToolRule
+from validation import STRUCTURAL, VALIDATION_MODES
+
+logger = logging.getLogger("mcp-voitta-gateway.config")
+
+
+class GatewayConfig:
+    """
+    A parsed Voitta configuration file with its gateway options.
+    """
+
+    def __init__(self, config_path: str):
+        """
+        Load and parse a configuration file.
+
+        Args:
+            config_path: Path to the Voitta configuration file.
+
+        Raises:
+            ValueError: If a tool rule or the validation mode is malformed.
+        """
+        self.config_path = config_path
+        # Prefix for this configuration's tools when federated ("" for none)
+        self.namespace = ""
+
+        with open(config_path, "rb") as f:
+            raw = f.read()
+
+        self.fingerprint = hashlib.sha256(raw).hexdigest()
+
+        voitta_config = yaml.safe_load(raw) or {}
+        self.settings: Dict[str, Any] = voitta_config.pop("gateway", None) or {}
+        self.mcp_config: Optional[Dict[str, Any]] = voitta_config.pop("mcp_config", None)
+        self.endpoints: List[Tuple[str, Dict[str, Any]]] = list(voitta_config.items())
+        self.tool_filter = ToolFilter(self.settings.get("tools"))
+        self.idempotent_rules = [ToolRule(rule) for rule in self.settings.get("idempotent_tools") or []]
+        self.argument_validation: str = self.settings.get("argument_validation") or STRUCTURAL
+        if self.argument_validation not in VALIDATION_MODES:
+            raise ValueError(
+                f"argument_validation must be one of {', '.join(VALIDATION_MODES)}, "
+                f"got {self.argument_validation!r}"
+            )
+
+        # Per-tool options: rules with the options of the tools they match
+        cache_settings = self.settings.get("result_cache") or {}
+        self.cache_rules = parse_tool_options(
+            cache_settings.get("tools"), {"ttl": cache_settings.get("ttl", 60)}
+        )
+        timeout_settings = self.settings.get("call_timeout") or {}
+        self.default_timeout: Optional[float] = timeout_settings.get("default")
+        self.max_timeout: Optional[float] = timeout_settings.get("max")
+        self.timeout_rules = parse_tool_options(timeout_settings.get("tools"), {"timeout": self.default_timeout})
+        retry_settings = self.settings.get("retry") or {}
+        self.retry_defaults = {
+            "attempts": retry_settings.get("attempts", 1),
+            "backoff": retry_settings.get("backoff", 0.2),
+            "max_backoff": retry_settings.get("max_backoff", 2.0),
+        }
+        self.retry_rules = parse_tool_options(retry_settings.get("tools"), self.retry_defaults)
+        hedging_settings = self.settings.get("hedging") or {}
+        self.hedging_defaults = {
+            "max_hedges": hedging_settings.get("max_hedges", 0),
+            "percentile": hedging_settings.get("percentile", 95),
+            "min_samples": hedging_settings.get("min_samples", 20),
+            "min_delay": hedging_settings.get("min_delay", 0.01),
+        }
+        self.hedging_rules = parse_tool_options(hedging_settings.get("tools"), self.hedging_defaults)
+        concurrency_settings = self.settings.get("concurrency") or {}
+        self.concurrency_rules = parse_tool_options(
+            concurrency_settings.get("tools"),
+            {
+                "max_concurrent": None,
+                "max_queue": concurrency_settings.get("max_queue"),
+                "queue_timeout": concurrency_settings.get("queue_timeout"),
+            },
+            required=("max_concurrent",),
+        )
+
+    def tool_policy(self, namespaces: Sequence[str], function_name: str, full_name: str) -> "ToolPolicy":
+        """
+        Work out how the gateway calls a tool from this configuration.
+
+        Args:
+            namespaces: The namespaces the tool is known under, including its upstream name.
+            function_name: The function name.
+            full_name: The full tool name.
+
+        Returns:
+            The tool's policy.
+        """
+        cache_options = match_tool_options(self.cache_rules, namespaces, function_name, full_name)
+        cache_ttl = float(cache_options["ttl"]) if cache_options is not None else None
+
+        # Cacheable tools are idempotent by definition
+        idempotent = cache_ttl is not None or any(
+            rule.matches(namespaces, function_name, full_name) for rule in self.idempotent_rules
+        )
+        concurrency = match_tool_options(self.concurrency_rules, namespaces, function_name, full_name)
+        timeout_options = match_tool_options(self.timeout_rules, namespaces, function_name, full_name)
+        timeout = timeout_options["timeout"] if timeout_options is not None else self.default_timeout
+
+        # Only calls that are safe to repeat are retried or hedged
+        retry = hedging = None
+        if idempotent:
+            retry = match_tool_options(self.retry_rules, namespaces, function_name, full_name) or self.retry_defaults
+            hedging = (
+                match_tool_options(self.hedging_rules, namespaces, function_name, full_name) or self.hedging_defaults
+            )
+
+        return ToolPolicy(
+            cache_ttl=cache_ttl,
+            idempotent=idempotent,
+            concurrency=concurrency,
+            timeout=timeout or None,
+            max_timeout=self.max_timeout,
+            retry=retry if retry is not None and retry["attempts"] > 1 else None,
+            hedging=hedging if hedging is not None and hedging["max_hedges"] > 0 else None,
+        )
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """
+        Get a gateway option.
+
+        Args:
+            key: The option name under the ``gateway`` section.
+            default: Value returned when the option is not set.
+
+        Returns:
+            The option value.
+        """
+        value = self.settings.get(key)
+        return default if value is None else value
+
+
+class ToolPolicy:
+    """
+    Per-tool call options resolved from the configuration.
+    """
+
+    __slots__ = ("cache_ttl", "idempotent", "concurrency", "timeout", "max_timeout", "retry", "hedging")
+
+    def __init__(
+        self,
+        cache_ttl: Optional[float] = None,
+        idempotent: bool = False,
+        concurrency: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None,
+        max_timeout: Optional[float] = None,
+        retry: Optional[Dict[str, Any]] = None,
+        hedging: Optional[Dict[str, Any]] = None,
+    ):
+        """
+        Initialize a policy.
+
+        Args:
+            cache_ttl: Seconds results are cached, or None if they are not.
+            idempotent: Whether identical calls may share or repeat a result.
+            concurrency: The tool's own concurrency limits, if any.
+            timeout: Default deadline of a call in seconds, or None for none.
+            max_timeout: Upper bound for deadlines requested by clients, or None.
+            retry: Retry options (``attempts``, ``backoff``, ``max_backoff``),
+                or None if failed calls are not retried.
+            hedging: Hedging options (``max_hedges``, ``percentile``,
+                ``min_samples``, ``min_delay``), or None if calls are not hedged.
+        """
+        self.cache_ttl = cache_ttl
+        self.idempotent = idempotent
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.max_timeout = max_timeout
+        self.retry = retry
+        self.hedging = hedging
+
+    def deadline(self, requested: Optional[float] = None) -> Optional[float]:
+        """
+        Get the deadline of a call.
+
+        Args:
+            requested: Deadline in seconds requested by the client, if any.
+
+        Returns:
+            Seconds the call may take, or None for no deadline.
+        """
+        if requested is None:
+            return self.timeout
+        if self.max_timeout:
+            return min(requested, self.max_timeout)
+        return requested
+
+
+def parse_tool_options(
+    rules: Optional[List[Any]], defaults: Dict[str, Any], required: Sequence[str] = ()
+) -> List[Tuple[ToolRule, Dict[str, Any]]]:
+    """
+    Compile tool rules that carry per-tool options.
+
+    Each rule is a tool rule as used by ``tools.allow``, whose mapping form
+    may also hold option keys.
+
+    Args:
+        rules: The rules from the configuration.
+        defaults: Option names and the values used when a rule omits them.
+        required: Option names every rule must set.
+
+    Returns:
+        List of (rule, options) pairs, in order.
+
+    Raises:
+        ValueError: If a rule is malformed or lacks a required option.
+    """
+    parsed = []
+    for rule in rules or []:
+        options = dict(defaults)
+        if isinstance(rule, dict):
+            rule = dict(rule)
+            for key in defaults:
+                if key in rule:
+                    options[key] = rule.pop(key)
+        missing = [key for key in required if not options.get(key)]
+        if missing:
+            raise ValueError(f"Tool rule {rule!r} must set {', '.join(missing)}")
+        parsed.append((ToolRule(rule), options))
+    return parsed
+
+
+def match_tool_options(
+    rules: List[Tuple[ToolRule, Dict[str, Any]]], namespaces: Sequence[str], function_name: str, full_name: str
+) -> Optional[Dict[str, Any]]:
+    """
+    Find the options of the first rule matching a tool.
+
+    Args:
+        rules: Rules compiled by parse_tool_options.
+        namespaces: The namespaces the tool is known under, including its upstream name.
+        function_name: The function name.
+        full_name: The full tool name.
+
+    Returns:
+        The matching rule's options, or None if no rule matches.
+    """
+    for rule, options in rules:
+        if rule.matches(namespaces, function_name, full_name):
+            return options
+    return None
+
+
+def config_files(config_paths: List[str]) -> List[str]:
+    """
+    Expand configuration paths into the files they refer to.
+
+    Args:
+        config_paths: Configuration files or directories of them.
+
+    Returns:
+        Files in the given order, with each directory's YAML files sorted by name.
+    """
+    files = []
+    for path in config_paths:
+        if os.path.isdir(path):
+            files.extend(
+                os.path.join(path, name) for name in sorted(os.listdir(path))
+                if name.endswith((".yaml", ".yml")) and not name.startswith(".")
+            )
+        else:
+            files.append(path)
+    return files
+
+
+def load_configs(config_paths: List[str]) -> List[GatewayConfig]:
+    """
+    Load every configuration file and assign their namespaces.
+
+    A single configuration is not prefixed unless it sets ``gateway.namespace``.
+    Federated configurations use ``gateway.namespace`` or their file name;
+    duplicates get a numeric suffix so every namespace is unique.
+
+    Args:
+        config_paths: Configuration files or directories of them.
+
+    Returns:
+        The loaded configurations, in order.
+
+    Raises:
+        ValueError: If no configuration file was found.
+    """
+    configs = [GatewayConfig(path) for path in config_files(config_paths)]
+    if not configs:
+        raise ValueError(f"No configuration files found in {config_paths}")
+
+    federated = len(configs) > 1
+    used = set()
+    for config in configs:
+        namespace = config.get("namespace")
+        if namespace is None and federated:
+            namespace = os.path.splitext(os.path.basename(config.config_path))[0]
+        namespace = re.sub(r"[^A-Za-z0-9]+", "_", str(namespace or "")).strip("_")
+        if not namespace:
+            continue
+
+        unique = namespace
+        suffix = 2
+        while unique in used:
+            unique = f"{namespace}{suffix}"
+            suffix += 1
+        if unique != namespace:
+            logger.warning(f"Namespace {namespace} of {config.config_path} is taken, using {unique}")
+        used.add(unique)
+        config.namespace = unique
+
+    return configs
+
+
+def create_router(endpoints: List[Tuple[str, Dict[str, Any]]], mcp_config: Optional[Dict[str, Any]]) -> VoittaRouter:
+    """
+    Create a VoittaRouter.
+
+    The router fetches OpenAPI descriptions synchronously and prints to
+    stdout while doing so; the server points stdout at stderr before any
+    router is created (see ``server.claim_stdout``), so routers can be built
+    concurrently in worker threads without touching ``sys.stdout``.
+
+    Args:
+        endpoints: Endpoint names and their configuration.
+        mcp_config: The ``mcp_config`` section, if any.
+
+    Returns:
+        The new router. MCP tools still need to be discovered.
+    """
+    return VoittaRouter(list(endpoints), mcp_config=mcp_config)
+
+
+async def call_function(voitta_router: VoittaRouter, name: str, arguments: Dict[str, Any]) -> Any:
+    """
+    Call a router function so that cancelling the call releases its resources.
+
+    HTTP requests to OpenAPI endpoints are aborted by the cancellation itself.
+    Voitta does not clean up cancelled MCP requests, so for those the pending
+    response is dropped and the MCP server is sent ``notifications/cancelled``.
+
+    Args:
+        voitta_router: The router that owns the function.
+        name: The router-local function name.
+        arguments: The function arguments.
+
+    Returns:
+        The raw result returned by the router.
+    """
+    process = None
+    namespace, _, mcp_name = name.partition(TOOL_DELIMITER)
+    if namespace == "mcp" and voitta_router.mcp is not None:
+        tool_id = voitta_router.mcp.operationIds.get(mcp_name)
+        if tool_id is not None:
+            process = voitta_router.mcp.server_processes.get(voitta_router.mcp.tools[tool_id]["server"])
+        if process is not None and not process.is_running():
+            # Restarting the process may interleave other requests; skip tracking
+            process = None
+
+    # A running process assigns the request ID before the call first suspends
+    request_id = str(process.request_id_counter) if process is not None else None
+    try:
+        # Using empty strings for token and oauth_token as they're not needed for this implementation
+        return await voitta_router.call_function(name, arguments, "", "")
+    except asyncio.CancelledError:
+        if process is not None:
+            cancel_mcp_request(process, request_id)
+        raise
+
+
+def cancel_mcp_request(process: Any, request_id: str):
+    """
+    Abandon a pending request to an MCP server process.
+
+    Only writes to the process without awaiting, since it runs while the
+    calling task is being cancelled.
+
+    Args:
+        process: Voitta's MCP server process.
+        request_id: ID of the abandoned request.
+    """
+    future = process.pending_requests.pop(request_id, None)
+    if future is None:
+        return
+    future.cancel()
+
+    notification = {
+        "jsonrpc": "2.0",
+        "method": "notifications/cancelled",
+        "params": {"requestId": request_id, "reason": "Cancelled by the gateway client"},
+    }
+    try:
+        process.process.stdin.write((json.dumps(notification) + "\n").encode("utf-8"))
+    except Exception as e:
+        logger.warning(f"Failed to send cancellation of MCP request {request_id}: {e}")
+
+
+async def close_router(voitta_router: VoittaRouter):
+    """
+    Release the resources held by a router that is no longer in use.
+
+    Args:
+        voitta_router: The router to close.
+    """
+    if voitta_router is None or voitta_router.mcp is None:
+        return
+
+    for server_name, process in list(voitta_router.mcp.server_processes.items()):
+        try:
+            await process.stop()
+        except Exception as e:
+            logger.error(f"Failed to stop MCP server {server_name}: {e}")
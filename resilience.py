@@ -0,0 +1,208 @@
+"""
+Retries and hedged requests for the MCP Voitta Gateway.
+
+Idempotent tools can be retried with jittered exponential backoff when a
+call fails with a transient error or returns an error result, and hedged:
+when a call has not finished after the tool's observed tail latency, a
+second identical call is started and whichever succeeds first wins.
+
+Voitta reports most upstream failures, such as an MCP server that is not
+running, as error results rather than exceptions, so results are checked
+with ``result_cache.is_success``.
+"""
+
+import asyncio
+import logging
+import random
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional
+
+import httpx
+
+from result_cache import is_success
+
+logger = logging.getLogger("mcp-voitta-gateway.resilience")
+
+# Errors worth retrying: the request may not have reached the upstream, or
+# the connection failed while waiting for it
+TRANSIENT_ERRORS = (httpx.TransportError, ConnectionError)
+
+# Number of recent latencies kept per tool
+LATENCY_SAMPLES = 200
+
+
+class LatencyTracker:
+    """
+    Recent successful call latencies of a tool.
+    """
+
+    def __init__(self, size: int = LATENCY_SAMPLES):
+        """
+        Initialize an empty tracker.
+
+        Args:
+            size: Number of recent latencies kept.
+        """
+        self._samples: Deque[float] = deque(maxlen=size)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def record(self, latency: float):
+        """
+        Record the latency of a successful call.
+
+        Args:
+            latency: Seconds the call took.
+        """
+        self._samples.append(latency)
+
+    def percentile(self, percentile: float, min_samples: int = 1) -> Optional[float]:
+        """
+        Get a latency percentile of the recent calls.
+
+        Args:
+            percentile: The percentile, between 0 and 100.
+            min_samples: Minimum number of samples for a meaningful answer.
+
+        Returns:
+            The latency in seconds, or None if there are too few samples.
+        """
+        if len(self._samples) < max(1, min_samples):
+            return None
+        ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, int(len(ordered) * percentile / 100))
+        return ordered[index]
+
+
+class Resilience:
+    """
+    Runs calls with retries and hedging, and counts how often each kicked in.
+    """
+
+    def __init__(self, succeeded: Callable[[Any], bool] = is_success):
+        """
+        Initialize the counters.
+
+        Args:
+            succeeded: Tells successful results from error results.
+        """
+        self.succeeded = succeeded
+        self.retries = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+
+    async def retry(
+        self,
+        call: Callable[[], Awaitable[Any]],
+        attempts: int = 1,
+        backoff: float = 0.2,
+        max_backoff: float = 2.0,
+    ) -> Any:
+        """
+        Run a call, retrying failures with jittered exponential backoff.
+
+        Transient errors and error results are retried; other exceptions are
+        raised at once.
+
+        Args:
+            call: Starts one attempt.
+            attempts: Maximum number of attempts, including the first.
+            backoff: Base delay before the first retry, in seconds.
+            max_backoff: Maximum delay between attempts, in seconds.
+
+        Returns:
+            The result of the first successful attempt, or the error result
+            of the last attempt.
+
+        Raises:
+            Exception: The error of the last attempt.
+        """
+        attempt = 1
+        while True:
+            try:
+                result = await call()
+            except TRANSIENT_ERRORS as e:
+                if attempt >= attempts:
+                    raise
+                failure = repr(e)
+            else:
+                if attempt >= attempts or self.succeeded(result):
+                    return result
+                failure = "an error result"
+
+            delay = min(backoff * 2 ** (attempt - 1), max_backoff) * random.uniform(0.5, 1.0)
+            logger.info(f"Attempt {attempt} failed with {failure}, retrying in {delay:.2f}s")
+            self.retries += 1
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    async def hedge(
+        self,
+        call: Callable[[], Awaitable[Any]],
+        delay: Optional[float],
+        max_hedges: int = 1,
+    ) -> Any:
+        """
+        Run a call, starting duplicates if it is slower than a delay.
+
+        The first attempt to succeed wins and the others are cancelled. An
+        attempt that raises or returns an error result does not end the call
+        while others are running.
+
+        Args:
+            call: Starts one attempt.
+            delay: Seconds to wait before each hedge, or None to never hedge.
+            max_hedges: Maximum number of extra attempts.
+
+        Returns:
+            The result of the first successful attempt, or the last attempt's
+            error result if all of them failed.
+
+        Raises:
+            Exception: The error of the last attempt if all of them failed.
+        """
+        if delay is None or max_hedges <= 0:
+            return await call()
+
+        first = asyncio.ensure_future(call())
+        attempts = [first]
+        pending = {first}
+        failed: Optional[asyncio.Future] = None
+        try:
+            while pending:
+                can_hedge = len(attempts) <= max_hedges
+                done, pending = await asyncio.wait(
+                    pending, timeout=delay if can_hedge else None, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is None and self.succeeded(task.result()):
+                        if task is not first:
+                            self.hedge_wins += 1
+                        return task.result()
+                    failed = task
+
+                if not done and can_hedge:
+                    self.hedges += 1
+                    hedge = asyncio.ensure_future(call())
+                    attempts.append(hedge)
+                    pending.add(hedge)
+            return failed.result()
+        finally:
+            for task in attempts:
+                if not task.done():
+                    task.cancel()
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Report how often retries and hedges were used.
+
+        Returns:
+            Dictionary with the number of retries, hedges started and hedges
+            that finished first.
+        """
+        return {
+            "retries": self.retries,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+        }
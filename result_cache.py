@@ -0,0 +1,173 @@
+"""
+Tool result caching for the MCP Voitta Gateway.
+
+Results of tools configured as cacheable are kept in memory for a per-tool
+TTL, keyed by the tool name and a hash of the upstream's source and the
+canonicalized arguments. Only successful results are stored. The cache is
+bounded and evicts the least recently used result first.
+"""
+
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Tuple
+
+from schema import structural_key
+
+# Returned by ResultCache.get when there is no usable result
+MISS = object()
+
+CacheKey = Tuple[str, bytes]
+
+
+def is_success(result: Any) -> bool:
+    """
+    Test whether a raw tool result reports success.
+
+    Voitta returns failed calls as error strings, and MCP servers mark
+    failed results with ``isError``; APIs commonly answer with a
+    ``status`` of ``error``.
+
+    Args:
+        result: The raw result returned by the router.
+
+    Returns:
+        False if the result is recognizably an error.
+    """
+    if isinstance(result, str):
+        if result.startswith("Error"):
+            return False
+        if not result.startswith("{") or ('"isError"' not in result and '"status"' not in result):
+            return True
+        try:
+            result = json.loads(result)
+        except ValueError:
+            return True
+
+    if isinstance(result, dict):
+        return not result.get("isError") and result.get("status") != "error"
+    return True
+
+
+class ResultCache:
+    """
+    TTL and size bounded LRU cache of tool results.
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        """
+        Initialize an empty cache.
+
+        Args:
+            max_entries: Maximum number of results kept.
+        """
+        self.max_entries = max_entries
+        # Key -> (expiry time, result), least recently used first
+        self._entries: "OrderedDict[CacheKey, Tuple[float, Any]]" = OrderedDict()
+        # Tool name -> [hits, misses]
+        self._tool_stats: Dict[str, list] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def key(name: str, arguments: Dict[str, Any], source: bytes = b"") -> CacheKey:
+        """
+        Build the cache key of a call.
+
+        Args:
+            name: The full tool name.
+            arguments: The call arguments.
+            source: Identity of the backend serving the tool, so results of
+                a backend replaced by a reload are not served for the new one.
+
+        Returns:
+            Key independent of the arguments' key order.
+        """
+        digest = hashlib.sha256(source)
+        digest.update(structural_key(arguments))
+        return name, digest.digest()
+
+    def get(self, key: CacheKey) -> Any:
+        """
+        Look up a result and count the hit or miss.
+
+        Args:
+            key: The call's cache key.
+
+        Returns:
+            The cached result, or MISS if there is none or it expired.
+        """
+        tool_stats = self._tool_stats.setdefault(key[0], [0, 0])
+        cached = self._entries.get(key)
+        if cached is not None:
+            expires, result = cached
+            if expires > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                tool_stats[0] += 1
+                return result
+            del self._entries[key]
+
+        self.misses += 1
+        tool_stats[1] += 1
+        return MISS
+
+    def put(self, key: CacheKey, result: Any, ttl: float):
+        """
+        Store a result, evicting the least recently used ones if full.
+
+        Args:
+            key: The call's cache key.
+            result: The result to store.
+            ttl: Seconds the result stays valid.
+        """
+        self._entries[key] = (time.monotonic() + ttl, result)
+        self._entries.move_to_end(key)
+        self._evict()
+
+    def resize(self, max_entries: int):
+        """
+        Change the maximum number of results kept.
+
+        Args:
+            max_entries: The new limit.
+        """
+        self.max_entries = max_entries
+        self._evict()
+
+    def _evict(self):
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def cache_info(self) -> Dict[str, Any]:
+        """
+        Report cache statistics.
+
+        Returns:
+            Dictionary with overall hit, miss and eviction counts, the number
+            of cached results and hits and misses per tool.
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self._entries),
+            "tools": {
+                name: {"hits": hits, "misses": misses}
+                for name, (hits, misses) in sorted(self._tool_stats.items())
+            },
+        }
+
+    def clear(self):
+        """Drop every cached result and reset the statistics."""
+        self._entries.clear()
+        self._tool_stats.clear()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
@@ -0,0 +1,228 @@
+"""
+Binary and typed tool results for the MCP Voitta Gateway.
+
+Tools can return more than text: raw bytes, file-like objects, payloads
+tagged with a MIME type, or MCP servers' own image and resource content.
+This module recognizes them so they are passed to clients as native
+``ImageContent`` or ``EmbeddedResource`` items instead of being rendered as
+text. Each payload is base64-encoded once; payloads that arrive already
+encoded are passed through as they are.
+"""
+
+import base64
+import binascii
+import hashlib
+import json
+from typing import Any, List, Optional, Tuple, Union
+
+import mcp.types as types
+
+# Leading bytes of common binary formats and their MIME types
+MAGIC_NUMBERS = (
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"GIF87a", "image/gif"),
+    (b"GIF89a", "image/gif"),
+    (b"%PDF-", "application/pdf"),
+    (b"PK\x03\x04", "application/zip"),
+    (b"\x1f\x8b", "application/gzip"),
+    (b"ID3", "audio/mpeg"),
+    (b"OggS", "audio/ogg"),
+)
+
+# Keys naming the MIME type of a payload returned as a mapping
+MIME_TYPE_KEYS = ("mimeType", "mime_type", "content_type")
+
+# Non-text/* MIME types, and structured syntax suffixes, whose payloads are text
+TEXT_MIME_TYPES = (
+    "application/json",
+    "application/xml",
+    "application/javascript",
+    "application/ecmascript",
+    "application/yaml",
+    "application/x-yaml",
+    "application/x-www-form-urlencoded",
+    "application/graphql",
+    "application/sql",
+)
+TEXT_MIME_SUFFIXES = ("+json", "+xml", "+yaml")
+
+# MCP content types that are not plain text
+BINARY_CONTENT_TYPES = ("image", "audio", "resource")
+
+BinaryPayload = Tuple[Union[bytes, str], str]
+
+
+def sniff_mime_type(data: bytes) -> Optional[str]:
+    """
+    Guess the MIME type of binary data from its leading bytes.
+
+    Args:
+        data: The data.
+
+    Returns:
+        The MIME type, ``text/plain`` for UTF-8 text without NUL bytes, or
+        None if unknown.
+    """
+    for magic, mime_type in MAGIC_NUMBERS:
+        if data.startswith(magic):
+            return mime_type
+    if data[:4] == b"RIFF" and data[8:12] in (b"WEBP", b"WAVE"):
+        return "image/webp" if data[8:12] == b"WEBP" else "audio/wav"
+    # Text holds no NUL bytes, which are common in binary formats
+    if b"\x00" in data[:1024]:
+        return None
+    try:
+        data.decode("utf-8")
+    except UnicodeDecodeError:
+        return None
+    return "text/plain"
+
+
+def is_text_mime_type(mime_type: str) -> bool:
+    """
+    Test whether a MIME type describes text.
+
+    Args:
+        mime_type: The MIME type, optionally with parameters.
+
+    Returns:
+        True for ``text/*``, JSON, XML, YAML and similar textual types.
+    """
+    base = mime_type.split(";", 1)[0].strip().lower()
+    return base.startswith("text/") or base in TEXT_MIME_TYPES or base.endswith(TEXT_MIME_SUFFIXES)
+
+
+def binary_payload(result: Any) -> Optional[BinaryPayload]:
+    """
+    Recognize a binary result.
+
+    Binary results are bytes, file-like objects returning bytes, and
+    mappings with a non-textual MIME type and ``data`` holding bytes or
+    valid base64 text.
+
+    Args:
+        result: The tool result.
+
+    Returns:
+        Tuple of the data and its MIME type, or None if the result is not
+        binary. The data is bytes, or a str if it arrived base64-encoded.
+    """
+    if hasattr(result, "read") and callable(result.read):
+        result = result.read()
+
+    if isinstance(result, (bytes, bytearray, memoryview)):
+        data = bytes(result)
+        return data, sniff_mime_type(data) or "application/octet-stream"
+
+    if isinstance(result, dict) and "data" in result:
+        mime_type = next((result[key] for key in MIME_TYPE_KEYS if isinstance(result.get(key), str)), None)
+        data = result["data"]
+        if mime_type is None or is_text_mime_type(mime_type):
+            return None
+        if isinstance(data, (bytes, bytearray, memoryview)):
+            return bytes(data), mime_type
+        if isinstance(data, str):
+            # Text that is not base64 is a text result rather than an encoded payload
+            try:
+                base64.b64decode(data, validate=True)
+            except (binascii.Error, ValueError):
+                return None
+            return data, mime_type
+    return None
+
+
+def decoded_size(data: Union[bytes, str]) -> int:
+    """
+    Get the size of a payload's bytes without decoding it.
+
+    Args:
+        data: Bytes, or base64 text.
+
+    Returns:
+        The number of bytes.
+    """
+    if isinstance(data, bytes):
+        return len(data)
+    return len(data) * 3 // 4 - data[-2:].count("=")
+
+
+def to_bytes(data: Union[bytes, str]) -> bytes:
+    """
+    Get a payload's bytes.
+
+    Args:
+        data: Bytes, or base64 text.
+
+    Returns:
+        The bytes.
+
+    Raises:
+        ValueError: If the text is not valid base64.
+    """
+    if isinstance(data, bytes):
+        return data
+    try:
+        return base64.b64decode(data, validate=True)
+    except binascii.Error as e:
+        raise ValueError(f"Invalid base64 data: {e}") from None
+
+
+def binary_content(data: Union[bytes, str], mime_type: str) -> Union[types.ImageContent, types.EmbeddedResource]:
+    """
+    Convert a binary payload to MCP content.
+
+    Args:
+        data: Bytes, or base64 text which is passed through unchanged.
+        mime_type: The payload's MIME type.
+
+    Returns:
+        ImageContent for images, otherwise an EmbeddedResource holding a blob.
+    """
+    encoded = data if isinstance(data, str) else base64.b64encode(data).decode("ascii")
+    if mime_type.startswith("image/"):
+        return types.ImageContent(type="image", data=encoded, mimeType=mime_type)
+
+    digest = hashlib.sha256(encoded.encode("ascii")).hexdigest()[:32]
+    return types.EmbeddedResource(
+        type="resource",
+        resource=types.BlobResourceContents(uri=f"voitta://blobs/{digest}", mimeType=mime_type, blob=encoded),
+    )
+
+
+def mcp_content(text: str) -> Optional[List[Any]]:
+    """
+    Recognize an MCP server's tool result that carries more than text.
+
+    Voitta returns MCP tool results as JSON text. When such a result holds
+    image, audio or resource items, its content is passed through as is.
+
+    Args:
+        text: The tool result.
+
+    Returns:
+        The MCP content items, or None if the text is not such a result.
+    """
+    if not text.startswith("{") or '"content"' not in text:
+        return None
+    try:
+        result = json.loads(text)
+    except ValueError:
+        return None
+
+    items = result.get("content") if isinstance(result, dict) else None
+    if not isinstance(items, list) or not any(
+        isinstance(item, dict) and item.get("type") in BINARY_CONTENT_TYPES for item in items
+    ):
+        return None
+
+    content_types = {
+        "text": types.TextContent,
+        "image": types.ImageContent,
+        "audio": types.AudioContent,
+        "resource": types.EmbeddedResource,
+    }
+    try:
+        return [content_types[item.get("type")].model_validate(item) for item in items]
+    except (KeyError, AttributeError, ValueError):
+        return None
@@ -0,0 +1,361 @@
+"""
+Spilled results for the MCP Voitta Gateway.
+
+Tool results too large to return inline are written to temporary files and
+served as ``voitta://results/<id>`` resources. Clients read them in pages by
+byte range, or by line range for text; reads memory-map the file, so only
+the requested range is loaded. Results are identified by a hash of their
+content, so the same result is stored once however often it is returned.
+"""
+
+import asyncio
+import contextlib
+import hashlib
+import logging
+import mmap
+import os
+import shutil
+import tempfile
+import time
+from array import array
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple, Union
+from urllib.parse import parse_qs, urlsplit
+
+logger = logging.getLogger("mcp-voitta-gateway.result_store")
+
+RESULT_URI_PREFIX = "voitta://results/"
+
+# Default maximum number of bytes returned by one read
+PAGE_SIZE = 65536
+
+
+class SpilledResult:
+    """A result stored in a temporary file."""
+
+    __slots__ = ("id", "path", "size", "mime_type", "created", "_line_offsets")
+
+    def __init__(self, result_id: str, path: str, size: int, mime_type: str):
+        self.id = result_id
+        self.path = path
+        self.size = size
+        self.mime_type = mime_type
+        self.created = time.time()
+        # Byte offset of the start of every line, indexed on the first line read
+        self._line_offsets: Optional[array] = None
+
+    @property
+    def is_text(self) -> bool:
+        """Whether the result is UTF-8 text rather than binary data."""
+        return self.mime_type.startswith("text/") or self.mime_type == "application/json"
+
+    @property
+    def uri(self) -> str:
+        """The resource URI of the result."""
+        return RESULT_URI_PREFIX + self.id
+
+    def line_offsets(self, data: mmap.mmap) -> array:
+        """
+        Get the byte offset of the start of every line.
+
+        Args:
+            data: The mapped file.
+
+        Returns:
+            The offsets, starting with 0.
+        """
+        if self._line_offsets is None:
+            offsets = array("Q", [0])
+            position = data.find(b"\n")
+            while position != -1 and position + 1 < self.size:
+                offsets.append(position + 1)
+                position = data.find(b"\n", position + 1)
+            self._line_offsets = offsets
+        return self._line_offsets
+
+
+def write_file(path: str, data: bytes):
+    """
+    Write a file atomically, so concurrent readers never see it partially written.
+
+    Args:
+        path: The file's path.
+        data: The file's content.
+    """
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(temp_path, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.remove(temp_path)
+        raise
+
+
+class ResultStore:
+    """
+    Bounded store of spilled results, evicting the least recently used.
+    """
+
+    def __init__(self, max_results: int = 100, max_bytes: int = 256 * 1024 * 1024):
+        """
+        Initialize an empty store.
+
+        Args:
+            max_results: Maximum number of results kept.
+            max_bytes: Maximum total size of the results kept.
+        """
+        self.max_results = max_results
+        self.max_bytes = max_bytes
+        self.directory: Optional[str] = None
+        self._parent: Optional[str] = None
+        self._results: "OrderedDict[str, SpilledResult]" = OrderedDict()
+        self._bytes = 0
+        self.spilled = 0
+        self.reads = 0
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+    def configure(self, settings: Dict[str, Any]):
+        """
+        Apply a ``large_results`` configuration block.
+
+        Results beyond the new limits are evicted. The ``directory`` only
+        takes effect if no result has been spilled yet.
+
+        Args:
+            settings: Mapping with optional ``max_results``, ``max_bytes`` and
+                ``directory``.
+        """
+        self.max_results = int(settings.get("max_results", 100))
+        self.max_bytes = int(settings.get("max_bytes", 256 * 1024 * 1024))
+        self._parent = settings.get("directory")
+        self._evict()
+
+    async def put(self, data: bytes, mime_type: str = "text/plain") -> SpilledResult:
+        """
+        Store a result.
+
+        The file is written in a worker thread, so spilling a large result
+        does not hold up other calls.
+
+        Args:
+            data: The encoded result.
+            mime_type: The result's MIME type.
+
+        Returns:
+            The stored result.
+        """
+        result_id = hashlib.sha256(data).hexdigest()[:32]
+        result = self._results.get(result_id)
+        if result is not None:
+            self._results.move_to_end(result_id)
+            return result
+
+        if self.directory is None or not os.path.isdir(self.directory):
+            self.directory = tempfile.mkdtemp(prefix="mcp-voitta-gateway-results-", dir=self._parent)
+
+        path = os.path.join(self.directory, result_id)
+        await asyncio.to_thread(write_file, path, data)
+
+        # The same result may have been stored while the file was written
+        result = self._results.get(result_id)
+        if result is not None:
+            self._results.move_to_end(result_id)
+            return result
+
+        result = SpilledResult(result_id, path, len(data), mime_type)
+        self._results[result_id] = result
+        self._bytes += result.size
+        self.spilled += 1
+        logger.info(f"Spilled {result.size} byte result to {path}")
+        self._evict(keep=result_id)
+        return result
+
+    def get(self, result_id: str) -> Optional[SpilledResult]:
+        """
+        Look up a stored result.
+
+        Args:
+            result_id: The result's ID.
+
+        Returns:
+            The result, or None if it is unknown or was evicted.
+        """
+        return self._results.get(result_id)
+
+    def results(self) -> List[SpilledResult]:
+        """
+        List the stored results.
+
+        Returns:
+            The results, most recently used last.
+        """
+        return list(self._results.values())
+
+    def read(self, uri: str, page_size: int = PAGE_SIZE) -> Tuple[SpilledResult, Union[str, bytes], Dict[str, Any]]:
+        """
+        Read a range of a stored result.
+
+        The URI's query selects the range: ``bytes=START-END`` with 0-based,
+        inclusive byte offsets, or ``lines=START-END`` with 1-based, inclusive
+        line numbers, for text only. Either end may be omitted. Without a
+        range the first page is read. At most ``page_size`` bytes are
+        returned; byte ranges of text are moved to character boundaries, and
+        line ranges are cut to whole lines unless a single line exceeds the
+        page.
+
+        Args:
+            uri: The resource URI, with an optional range query.
+            page_size: Maximum number of bytes returned.
+
+        Returns:
+            Tuple of the result, the text or bytes read and metadata with the
+            range read, the total size and the URI of the next page, if any.
+
+        Raises:
+            KeyError: If the result is unknown or was evicted.
+            ValueError: If the URI or the range is invalid.
+        """
+        parts = urlsplit(uri)
+        if f"{parts.scheme}://{parts.netloc}/" != RESULT_URI_PREFIX or not parts.path.strip("/"):
+            raise ValueError(f"Not a result URI: {uri}")
+        result_id = parts.path.strip("/")
+        result = self._results.get(result_id)
+        if result is None:
+            raise KeyError(f"Unknown or expired result: {result_id}")
+        self._results.move_to_end(result_id)
+        self.reads += 1
+
+        query = parse_qs(parts.query)
+        if "lines" in query and not result.is_text:
+            raise ValueError(f"Line ranges are not available for {result.mime_type} results")
+        if result.size == 0:
+            return result, "" if result.is_text else b"", {"total_bytes": 0, "range": "bytes=0-0", "next": None}
+
+        with open(result.path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            if "lines" in query:
+                return (result,) + self._read_lines(result, data, query["lines"][0], page_size)
+            return (result,) + self._read_bytes(result, data, query.get("bytes", ["0-"])[0], page_size)
+
+    def _read_bytes(
+        self, result: SpilledResult, data: mmap.mmap, spec: str, page_size: int
+    ) -> Tuple[Union[str, bytes], Dict[str, Any]]:
+        first, last = _parse_range(spec, 0, result.size - 1)
+        if not result.is_text:
+            end = min(last + 1, first + page_size)
+            meta = {
+                "total_bytes": result.size,
+                "range": f"bytes={first}-{end - 1}",
+                "next": f"{result.uri}?bytes={end}-{last}" if end <= last else None,
+            }
+            return data[first:end], meta
+
+        start = _char_start(data, first, result.size)
+        end = _char_start(data, min(last + 1, start + page_size), result.size)
+        if end <= start and start < result.size:
+            # A page smaller than one character still returns that character
+            end = _char_start(data, start + 1, result.size, forward=True)
+
+        meta = {
+            "total_bytes": result.size,
+            "range": f"bytes={start}-{end - 1}",
+            "next": f"{result.uri}?bytes={end}-{last}" if end <= last else None,
+        }
+        return data[start:end].decode("utf-8", errors="replace"), meta
+
+    def _read_lines(
+        self, result: SpilledResult, data: mmap.mmap, spec: str, page_size: int
+    ) -> Tuple[str, Dict[str, Any]]:
+        offsets = result.line_offsets(data)
+        first, last = _parse_range(spec, 1, len(offsets))
+        start = offsets[first - 1]
+
+        # Whole lines that fit in the page, at least one
+        line = first
+        while line < last and _line_end(offsets, line + 1, result.size) - start <= page_size:
+            line += 1
+        end = _line_end(offsets, line, result.size)
+        text_end = _char_start(data, min(end, start + page_size), result.size)
+        if text_end <= start:
+            text_end = _char_start(data, start + 1, result.size, forward=True)
+
+        meta = {
+            "total_bytes": result.size,
+            "total_lines": len(offsets),
+            "range": f"lines={first}-{line}",
+            "next": f"{result.uri}?lines={line + 1}-{last}" if line < last else None,
+        }
+        if text_end < end:
+            # The line alone exceeds the page; continue it by byte range
+            meta["next"] = f"{result.uri}?bytes={text_end}-{end - 1}"
+        return data[start:text_end].decode("utf-8", errors="replace"), meta
+
+    def _evict(self, keep: Optional[str] = None):
+        while self._results and (len(self._results) > self.max_results or self._bytes > self.max_bytes):
+            result_id = next(iter(self._results))
+            if result_id == keep:
+                break
+            self._remove(self._results.pop(result_id))
+
+    def _remove(self, result: SpilledResult):
+        self._bytes -= result.size
+        try:
+            os.remove(result.path)
+        except OSError as e:
+            logger.warning(f"Could not remove spilled result {result.path}: {e}")
+
+    def clear(self):
+        """Remove every stored result and the spill directory."""
+        self._results.clear()
+        self._bytes = 0
+        if self.directory is not None:
+            shutil.rmtree(self.directory, ignore_errors=True)
+            self.directory = None
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Report the store's size and usage.
+
+        Returns:
+            Dictionary with the number and total size of stored results, and
+            the number of results spilled and reads served.
+        """
+        return {
+            "results": len(self._results),
+            "bytes": self._bytes,
+            "spilled": self.spilled,
+            "reads": self.reads,
+        }
+
+
+def _parse_range(spec: str, lowest: int, highest: int) -> Tuple[int, int]:
+    """Parse ``START-END`` with optional ends, clamped to [lowest, highest]."""
+    start_text, separator, end_text = spec.partition("-")
+    try:
+        if not separator:
+            start = end = int(start_text)
+        else:
+            start = int(start_text) if start_text.strip() else lowest
+            end = int(end_text) if end_text.strip() else highest
+    except ValueError:
+        raise ValueError(f"Invalid range: {spec!r}") from None
+    if start < lowest or start > highest or end < start:
+        raise ValueError(f"Range {spec!r} is outside {lowest}-{highest}")
+    return start, min(end, highest)
+
+
+def _line_end(offsets: array, line: int, size: int) -> int:
+    """Byte offset just past a 1-based line."""
+    return offsets[line] if line < len(offsets) else size
+
+
+def _char_start(data: mmap.mmap, position: int, size: int, forward: bool = False) -> int:
+    """Move a byte offset off UTF-8 continuation bytes, backwards unless ``forward``."""
+    position = min(position, size)
+    step = 1 if forward else -1
+    while 0 < position < size and data[position] & 0xC0 == 0x80:
+        position += step
+    return position
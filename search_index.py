@@ -0,0 +1,163 @@
+"""
+In-memory tool search for the MCP Voitta Gateway.
+
+A small BM25 inverted index over tool names, namespaces and descriptions,
+used by the ``search_tools`` meta-tool so clients can discover tools on demand
+instead of listing the whole catalog.
+"""
+
+import math
+import re
+from collections import Counter
+from typing import Dict, Iterable, List, Tuple
+
+from catalog import CatalogEntry
+
+# Term frequency multipliers per field
+FIELD_WEIGHTS = {
+    "name": 3,
+    "namespace": 2,
+    "description": 1,
+}
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+_CAMEL_CASE = re.compile(r"([a-z0-9])([A-Z])")
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into lowercase search terms.
+
+    camelCase and snake_case identifiers are split into their words.
+
+    Args:
+        text: The text to tokenize.
+
+    Returns:
+        List of terms.
+    """
+    return _TOKEN.findall(_CAMEL_CASE.sub(r"\1 \2", text).lower())
+
+
+class ToolSearchIndex:
+    """
+    BM25 inverted index over catalog entries, keyed by full tool name.
+    """
+
+    def __init__(self):
+        """Initialize an empty index."""
+        self._postings: Dict[str, Dict[str, int]] = {}
+        self._doc_terms: Dict[str, Counter] = {}
+        self._doc_lengths: Dict[str, int] = {}
+        self._signatures: Dict[str, Tuple[str, str]] = {}
+        self._total_length = 0
+
+    def __len__(self) -> int:
+        return len(self._doc_lengths)
+
+    def add(self, entry: CatalogEntry):
+        """
+        Index a catalog entry, replacing any previous version of it.
+
+        Args:
+            entry: The entry to index.
+        """
+        if entry.full_name in self._doc_lengths:
+            self.remove(entry.full_name)
+
+        terms = Counter()
+        fields = {
+            "name": entry.name,
+            "namespace": entry.namespace,
+            "description": entry.description or "",
+        }
+        for field, text in fields.items():
+            for term in tokenize(text):
+                terms[term] += FIELD_WEIGHTS[field]
+
+        for term, frequency in terms.items():
+            self._postings.setdefault(term, {})[entry.full_name] = frequency
+
+        length = sum(terms.values())
+        self._doc_terms[entry.full_name] = terms
+        self._doc_lengths[entry.full_name] = length
+        self._signatures[entry.full_name] = (entry.name, entry.description)
+        self._total_length += length
+
+    def remove(self, full_name: str):
+        """
+        Remove a tool from the index.
+
+        Args:
+            full_name: The full name of the tool to remove.
+        """
+        terms = self._doc_terms.pop(full_name, None)
+        if terms is None:
+            return
+
+        for term in terms:
+            postings = self._postings[term]
+            del postings[full_name]
+            if not postings:
+                del self._postings[term]
+
+        self._total_length -= self._doc_lengths.pop(full_name)
+        del self._signatures[full_name]
+
+    def update(self, entries: Iterable[CatalogEntry]) -> Tuple[int, int]:
+        """
+        Bring the index in line with a new catalog, touching only what changed.
+
+        Args:
+            entries: Every entry of the new catalog.
+
+        Returns:
+            Tuple of the number of tools (re)indexed and removed.
+        """
+        current = {}
+        added = 0
+        for entry in entries:
+            current[entry.full_name] = entry
+            if self._signatures.get(entry.full_name) != (entry.name, entry.description):
+                self.add(entry)
+                added += 1
+
+        stale = [full_name for full_name in self._doc_lengths if full_name not in current]
+        for full_name in stale:
+            self.remove(full_name)
+
+        return added, len(stale)
+
+    def search(self, query: str, limit: int = 10) -> List[Tuple[str, float]]:
+        """
+        Rank tools against a free-text query.
+
+        Args:
+            query: The search query.
+            limit: Maximum number of results.
+
+        Returns:
+            List of (full name, score) pairs, best match first.
+        """
+        document_count = len(self._doc_lengths)
+        if not document_count:
+            return []
+
+        average_length = self._total_length / document_count
+        scores: Dict[str, float] = {}
+        for term in set(tokenize(query)):
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+
+            idf = math.log(1 + (document_count - len(postings) + 0.5) / (len(postings) + 0.5))
+            for full_name, frequency in postings.items():
+                norm = K1 * (1 - B + B * self._doc_lengths[full_name] / average_length)
+                scores[full_name] = scores.get(full_name, 0.0) + idf * frequency * (K1 + 1) / (frequency + norm)
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        return ranked[:limit]
@@ -0,0 +1,106 @@
+"""
+JSON serialization for the MCP Voitta Gateway.
+
+Tool results, built-in tool responses and logged statistics are rendered
+through one serializer. It is compact by default, since every byte is written
+to stdio, parsed by the client and read by the model. Pretty printing is
+available for debugging. orjson or msgspec are used when installed, and
+values they cannot encode fall back to the standard library encoder.
+"""
+
+import json
+import logging
+from typing import Any, Callable, Dict, Optional
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+logger = logging.getLogger("mcp-voitta-gateway.serialization")
+
+BACKENDS = ("auto", "orjson", "msgspec", "json")
+
+
+class JsonSerializer:
+    """
+    Renders JSON-compatible values as text with a configurable backend.
+    """
+
+    def __init__(self, backend: str = "auto", pretty: bool = False):
+        """
+        Initialize a serializer.
+
+        Args:
+            backend: ``orjson``, ``msgspec``, ``json``, or ``auto`` for the
+                fastest one installed. An unavailable backend falls back to
+                ``json`` with a warning.
+            pretty: Indent output for readability instead of making it compact.
+
+        Raises:
+            ValueError: If the backend is unknown.
+        """
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown serialization backend '{backend}', expected one of {list(BACKENDS)}")
+
+        if backend == "auto":
+            backend = "orjson" if orjson is not None else "msgspec" if msgspec is not None else "json"
+        elif (backend == "orjson" and orjson is None) or (backend == "msgspec" and msgspec is None):
+            logger.warning(f"Serialization backend {backend} is not installed, using json")
+            backend = "json"
+
+        self.backend = backend
+        self.pretty = pretty
+        self._encode: Optional[Callable[[Any], str]] = getattr(self, f"_encode_{backend}", None)
+
+    @classmethod
+    def from_settings(cls, settings: Dict[str, Any]) -> "JsonSerializer":
+        """
+        Create a serializer from a ``serialization`` configuration block.
+
+        Args:
+            settings: Mapping with optional ``backend`` and ``pretty``.
+
+        Returns:
+            The serializer.
+        """
+        return cls(settings.get("backend", "auto"), bool(settings.get("pretty", False)))
+
+    def dumps(self, value: Any) -> str:
+        """
+        Serialize a value.
+
+        Args:
+            value: The value; objects that are not JSON-compatible are
+                rendered with ``str``.
+
+        Returns:
+            The JSON text.
+        """
+        if self._encode is not None:
+            try:
+                return self._encode(value)
+            except (TypeError, ValueError, OverflowError):
+                # e.g. integers beyond 64 bits or non-string keys
+                pass
+        return self._encode_json(value)
+
+    def _encode_orjson(self, value: Any) -> str:
+        option = orjson.OPT_INDENT_2 if self.pretty else 0
+        return orjson.dumps(value, default=str, option=option).decode("utf-8")
+
+    def _encode_msgspec(self, value: Any) -> str:
+        encoded = msgspec.json.encode(value, enc_hook=str)
+        if self.pretty:
+            encoded = msgspec.json.format(encoded, indent=2)
+        return encoded.decode("utf-8")
+
+    def _encode_json(self, value: Any) -> str:
+        if self.pretty:
+            return json.dumps(value, indent=2, ensure_ascii=False, default=str)
+        return json.dumps(value, separators=(",", ":"), ensure_ascii=False, default=str)
@@ -8,12 +8,20 @@ exposing Voitta tools via the Model Context Protocol (MCP).
 
 import argparse
 import asyncio
-import json
+import contextlib
+import contextvars
+import fnmatch
+import io
 import logging
 import os
+import random
+import signal
 import sys
-from typing import Any, Dict, List, Optional
+import time
+import weakref
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Union
 
+import anyio
 import yaml
 import mcp.server
 import mcp.server.stdio
@@ -23,6 +31,8 @@ from mcp.server import (
     NotificationOptions,
     Server,
 )
+from mcp.server.lowlevel.helper_types import ReadResourceContents
+from mcp.shared.exceptions import McpError
 
 # Configure logging to write to file
 import os
@@ -45,114 +55,1429 @@ logger.propagate = False  # Prevent logs from being sent to stderr
 # Import VoittaRouter (assuming voitta is installed with pip)
 from voitta import VoittaRouter
 
+from catalog import CatalogEntry, ToolCatalog, list_page, to_mcp_tool
+from circuit_breaker import OPEN
+from concurrency import ConcurrencyLimiter
+from gateway_config import GatewayConfig, ToolPolicy, call_function, close_router, config_files, load_configs
+from resilience import LatencyTracker, Resilience
+from result_cache import MISS, ResultCache, is_success
+from result_content import binary_content, binary_payload, decoded_size, mcp_content, to_bytes
+from result_store import PAGE_SIZE, ResultStore
+from search_index import ToolSearchIndex
+from serialization import JsonSerializer
+from single_flight import SingleFlight
+from snapshot import load_snapshot, save_snapshot, snapshot_key, snapshot_path
+from streaming import ProgressStream
+from upstreams import Upstream, upstreams_from_config
+from validation import validate_arguments
+
+# Set by call_upstream for calls with a deadline: when the call first got past
+# the concurrency limits and started waiting on its upstream, once it has
+upstream_reached: contextvars.ContextVar[Optional[List[float]]] = contextvars.ContextVar(
+    "upstream_reached", default=None
+)
+
+# JSON-RPC error code for unknown resources
+RESOURCE_NOT_FOUND = -32002
+
+# Built-in tool returning the full definition of a single tool
+TOOL_INFO_TOOL = types.Tool(
+    name="get_voitta_tool_info",
+    description=(
+        "Get detailed information about a specific Voitta tool, including its full "
+        "description and the JSON Schema of its parameters."
+    ),
+    inputSchema={
+        "type": "object",
+        "properties": {
+            "tool_name": {"type": "string", "description": "Name of the tool to describe"},
+        },
+        "required": ["tool_name"],
+    },
+)
+
+# Built-in tool calling several tools concurrently
+BATCH_CALL_TOOL = types.Tool(
+    name="batch_call",
+    description=(
+        "Call several tools at once. The calls run concurrently and their results are "
+        "returned in the order given, each with its own status, so one failed call does "
+        "not fail the others. Use it instead of consecutive calls that do not depend on "
+        "each other's results."
+    ),
+    inputSchema={
+        "type": "object",
+        "properties": {
+            "calls": {
+                "type": "array",
+                "description": "The calls to make",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "tool": {"type": "string", "description": "Name of the tool to call"},
+                        "arguments": {"type": "object", "description": "Arguments for the tool"},
+                    },
+                    "required": ["tool"],
+                },
+                "minItems": 1,
+            },
+        },
+        "required": ["calls"],
+    },
+)
+
+# Built-in tool for discovering tools that are not listed
+SEARCH_TOOL = types.Tool(
+    name="search_tools",
+    description=(
+        "Search the available tools by keyword. Returns the name, description and "
+        "input schema of the best matching tools, which can then be called by name."
+    ),
+    inputSchema={
+        "type": "object",
+        "properties": {
+            "query": {"type": "string", "description": "Keywords describing the task or tool"},
+            "limit": {"type": "integer", "description": "Maximum number of tools to return"},
+        },
+        "required": ["query"],
+    },
+)
+
+
+def claim_stdout() -> io.TextIOWrapper:
+    """
+    Reserve the process's stdout for the stdio transport.
+
+    Voitta prints to stdout while creating routers, which may happen in
+    several worker threads at once. Rather than swapping ``sys.stdout``
+    around each of them, the real stdout is duplicated once for the
+    transport, and file descriptor 1 and ``sys.stdout`` are pointed at
+    stderr for everything else, including child processes.
+
+    Returns:
+        A text stream writing to the original stdout.
+    """
+    sys.stdout.flush()
+    transport_fd = os.dup(sys.stdout.fileno())
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+    sys.stdout = sys.stderr
+    return io.TextIOWrapper(os.fdopen(transport_fd, "wb"), encoding="utf-8")
+
+
+class ToolCallError(Exception):
+    """Raised when a tool call is rejected before reaching the upstream."""
+
 
 class VoittaMcpServer:
     """
     MCP Server implementation that exposes Voitta tools via the Model Context Protocol.
     """
 
-    def __init__(self, config_path: str):
+    def __init__(self, config_paths: List[str]):
         """
         Initialize the Voitta MCP Server.
 
         Args:
-            config_path: Path to the Voitta configuration file.
+            config_paths: Voitta configuration files, or directories of them.
+                The first configuration provides the gateway-wide options.
         """
-        self.config_path = config_path
-        self.voitta_router = None
+        self.config_paths = config_paths
+        self.configs: List[GatewayConfig] = []
+        self.config = None
+        self.upstreams: Dict[str, Upstream] = {}
+        self.catalog = ToolCatalog([])
+        self.search_index = None
+        self.snapshot_path = None
         self.server = Server("voitta-gateway")
+
+        # Set once the first discovery has finished, successfully or not
+        self._discovered = asyncio.Event()
+
+        # Built-in tools handled by the gateway itself, by name
+        self.meta_tools: Dict[str, Tuple[types.Tool, Callable[[Dict[str, Any]], Awaitable[List[types.TextContent]]]]] = {}
+        # Tools returned by list_tools, cached for the catalog they were built from
+        self._listed: Tuple[Optional[ToolCatalog], List[types.Tool]] = (None, [])
+        # Every callable tool for the MCP SDK's tool cache, likewise cached
+        self._callable: Tuple[Optional[ToolCatalog], List[types.Tool]] = (None, [])
+
+        # Sessions that listed tools and should hear about catalog changes
+        self._sessions = weakref.WeakSet()
+        self._background_tasks = set()
+        self._refresh_task: Optional[asyncio.Task] = None
+
+        # Serializes configuration reloads; the key identifies the loaded
+        # configuration file and the MCP settings it references
+        self._reload_lock = asyncio.Lock()
+        self._config_key: Optional[str] = None
+
+        # Call policy of each tool called since the catalog was last swapped
+        self._policies: Dict[str, ToolPolicy] = {}
+
+        # Cached results of cacheable tools, and identical idempotent calls in flight
+        self.result_cache = ResultCache()
+        self.single_flight = SingleFlight()
+
+        # Renders results, built-in tool responses and logged statistics
+        self.serializer = JsonSerializer()
+
+        # Results too large to return inline, served as resources
+        self.result_store = ResultStore()
+
+        # Concurrency limits of tools that have their own, by full name
+        self._tool_limiters: Dict[str, ConcurrencyLimiter] = {}
+
+        # Retries and hedging of idempotent tools, and their recent latencies
+        self.resilience = Resilience()
+        self._latencies: Dict[str, LatencyTracker] = {}
+
+        # Calls in flight per router, so replaced routers can drain before closing
+        self._inflight: Dict[VoittaRouter, int] = {}
+        self._drained: Dict[VoittaRouter, asyncio.Event] = {}
+
         self.setup_handlers()
 
     async def initialize(self):
-        """Initialize the Voitta router."""
+        """Initialize the upstreams and discover their tools."""
         try:
-            # Initialize the router with the configuration file path directly
-            self.voitta_router = VoittaRouter(self.config_path)
-            
-            # Discover MCP tools if any
-            await self.voitta_router.discover_mcp_tools()
+            self.configs = load_configs(self.config_paths)
+            self.config = self.configs[0]
+            self._config_key = snapshot_key(self.configs)
+            self.setup_meta_tools()
+            self.result_cache.resize(self.config.get("result_cache", {}).get("max_entries", 1024))
+            self.serializer = JsonSerializer.from_settings(self.config.get("serialization", {}))
+            self.result_store.configure(self.config.get("large_results", {}))
+            self.upstreams = {
+                upstream.name: upstream
+                for config in self.configs
+                for upstream in upstreams_from_config(config)
+            }
+            for upstream in self.upstreams.values():
+                upstream.on_breaker_change = self.breaker_changed
+
+            # Serve the last known catalog (or whatever is ready) while discovery
+            # runs, otherwise discover every upstream first
+            snapshot_loaded = self.load_catalog_snapshot()
+            if snapshot_loaded or self.config.get("background_discovery", False):
+                self.start_background(self.discover(publish_each=True))
+            else:
+                await self.discover()
             
             logger.info("Initialized Voitta MCP Server")
         except Exception as e:
             logger.error(f"Failed to initialize Voitta MCP Server: {e}")
             raise
 
+    def load_catalog_snapshot(self) -> bool:
+        """
+        Install the catalog snapshot for the current configuration, if any.
+
+        Returns:
+            True if a snapshot was loaded.
+        """
+        self.snapshot_path = self.configured_snapshot_path(self.configs)
+        if self.snapshot_path is None:
+            return False
+
+        voitta_tools = load_snapshot(self.snapshot_path)
+        if voitta_tools is None:
+            return False
+
+        for upstream in self.upstreams.values():
+            upstream.tools = [tool for tool in voitta_tools if tool.get("upstream") == upstream.name]
+
+        self.set_catalog(ToolCatalog(voitta_tools, self.catalog, self.validation_modes()))
+        logger.info(f"Loaded {len(self.catalog)} tools from snapshot {self.snapshot_path}")
+        return True
+
+    def configured_snapshot_path(self, configs: List[GatewayConfig]) -> Optional[str]:
+        """
+        Get the snapshot file for a set of configurations.
+
+        Args:
+            configs: The gateway configurations; the first one holds the
+                snapshot options.
+
+        Returns:
+            Path of the snapshot file, or None if snapshots are disabled.
+        """
+        snapshot_settings = configs[0].get("snapshot", {})
+        if not snapshot_settings.get("enabled", False):
+            return None
+        return snapshot_path(configs, snapshot_settings.get("directory", log_dir))
+
+    async def reload_config(self) -> bool:
+        """
+        Reload the configuration files and swap in the upstreams they describe.
+
+        Upstreams whose definition did not change keep their router. New and
+        changed upstreams are discovered before anything is swapped, so
+        clients keep using the current catalog until the new one is complete.
+        Routers of removed or replaced upstreams are closed once their
+        in-flight calls have drained.
+
+        Returns:
+            True if a new configuration was applied.
+        """
+        async with self._reload_lock:
+            try:
+                configs = await asyncio.to_thread(load_configs, self.config_paths)
+                config_key = await asyncio.to_thread(snapshot_key, configs)
+            except Exception as e:
+                logger.error(f"Failed to reload {self.config_paths}, keeping the current configuration: {e}")
+                return False
+
+            if config_key == self._config_key:
+                return False
+
+            logger.info(f"Reloading configuration from {self.config_paths}")
+            current = self.upstreams
+            upstreams = {}
+            for config in configs:
+                for upstream in upstreams_from_config(config):
+                    previous = current.get(upstream.name)
+                    if previous is not None and previous.source == upstream.source:
+                        previous.reconfigure(config)
+                        upstream = previous
+                    upstream.on_breaker_change = self.breaker_changed
+                    upstreams[upstream.name] = upstream
+
+            new_upstreams = [upstream for name, upstream in upstreams.items() if upstream is not current.get(name)]
+            await asyncio.gather(*(self.refresh_upstream(upstream) for upstream in new_upstreams))
+
+            # Swap configuration, upstreams and catalog together
+            self.configs = configs
+            self.config = configs[0]
+            self._config_key = config_key
+            self.upstreams = upstreams
+            self.snapshot_path = self.configured_snapshot_path(configs)
+            self.setup_meta_tools()
+            self.result_cache.resize(self.config.get("result_cache", {}).get("max_entries", 1024))
+            self.serializer = JsonSerializer.from_settings(self.config.get("serialization", {}))
+            self.result_store.configure(self.config.get("large_results", {}))
+            await self.publish_catalog(force=True)
+
+            for name, upstream in current.items():
+                if upstreams.get(name) is not upstream:
+                    upstream.retired = True
+                    if upstream.retry_task is not None:
+                        upstream.retry_task.cancel()
+                    if upstream.breaker is not None:
+                        upstream.breaker.close()
+                    self.start_background(self.retire_router(upstream.router))
+
+            if self._refresh_task is not None:
+                self._refresh_task.cancel()
+            self.start_refresh_loop()
+
+            logger.info(
+                f"Configuration reloaded: {len(new_upstreams)} upstreams rediscovered, "
+                f"{len(upstreams) - len(new_upstreams)} kept"
+            )
+            return True
+
+    async def watch_config(self):
+        """Reload the configuration whenever a configuration file changes on disk."""
+        def file_state():
+            state = []
+            for path in config_files(self.config_paths):
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    return None
+                state.append((path, stat.st_mtime_ns, stat.st_size))
+            return state
+
+        last_state = file_state()
+        while True:
+            interval = self.config.get("reload_interval", 5)
+            if interval <= 0:
+                return
+            await asyncio.sleep(interval)
+
+            state = file_state()
+            if state is None or state == last_state:
+                continue
+            last_state = state
+            try:
+                await self.reload_config()
+            except Exception as e:
+                logger.error(f"Configuration reload failed: {e}")
+
+    async def discover(self, publish_each: bool = False):
+        """
+        Discover every upstream concurrently and publish the merged catalog.
+
+        Each upstream has its own deadline, so startup is bounded by the
+        slowest upstream that answers in time. Upstreams that fail or time out
+        are left out and retried in the background.
+
+        Args:
+            publish_each: Publish the catalog as each upstream completes
+                instead of once at the end.
+        """
+        try:
+            await asyncio.gather(*(
+                self.refresh_upstream(upstream, publish=publish_each)
+                for upstream in self.upstreams.values()
+            ))
+            await self.publish_catalog()
+        finally:
+            self._discovered.set()
+
+        failed = [upstream.name for upstream in self.upstreams.values() if upstream.router is None]
+        if failed:
+            logger.error(f"Discovery incomplete, retrying in the background: {failed}")
+
+    async def wait_for_event(self, event: asyncio.Event) -> bool:
+        """
+        Wait for a startup event, bounded by the configured ready timeout.
+
+        Args:
+            event: The event to wait for.
+
+        Returns:
+            True if the event is set, False if the wait timed out.
+        """
+        if event.is_set():
+            return True
+        if self.config is None:
+            return False
+
+        try:
+            await asyncio.wait_for(event.wait(), self.config.get("ready_timeout", 30))
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+    async def refresh_upstream(self, upstream: Upstream, publish: bool = False) -> bool:
+        """
+        Discover one upstream and swap in its new router.
+
+        A failed or timed out discovery keeps the upstream's current router
+        and tools and schedules a retry. A refresh that finds the same tools
+        as before is discarded.
+
+        Args:
+            upstream: The upstream to discover.
+            publish: Publish the merged catalog if the upstream changed.
+
+        Returns:
+            True if the upstream's tools changed.
+        """
+        discovery_settings = upstream.config.get("discovery", {})
+        try:
+            # A timed out router creation keeps running in its worker thread;
+            # the router it produces is simply never used
+            voitta_router, tools = await asyncio.wait_for(
+                upstream.discover(), discovery_settings.get("timeout", 30)
+            )
+        except Exception as e:
+            upstream.failures += 1
+            logger.error(f"Discovery of upstream {upstream.name} failed ({upstream.failures} in a row): {e!r}")
+            if not upstream.retired:
+                self.schedule_retry(upstream)
+            return False
+
+        if upstream.retired:
+            # Dropped by a configuration reload while discovery was running
+            await close_router(voitta_router)
+            return False
+
+        upstream.failures = 0
+        previous_router = upstream.router
+        changed = tools != upstream.tools
+        if previous_router is not None and not changed:
+            await close_router(voitta_router)
+            return False
+
+        # Swap router and tools together so calls never see a mixed pair
+        upstream.router, upstream.tools = voitta_router, tools
+        logger.info(f"Upstream {upstream.name} ready with {len(tools)} tools")
+        self.start_background(self.retire_router(previous_router))
+
+        if publish and changed:
+            await self.publish_catalog()
+        return changed
+
+    def schedule_retry(self, upstream: Upstream):
+        """
+        Retry a failed upstream after an exponential, jittered backoff.
+
+        Args:
+            upstream: The upstream whose discovery failed.
+        """
+        if upstream.retry_task is not None and not upstream.retry_task.done():
+            return
+
+        discovery_settings = upstream.config.get("discovery", {})
+        delay = min(
+            discovery_settings.get("retry_initial", 1) * 2 ** (upstream.failures - 1),
+            discovery_settings.get("retry_max", 300),
+        )
+        delay *= random.uniform(0.5, 1.0)
+        logger.info(f"Retrying upstream {upstream.name} in {delay:.1f}s")
+        upstream.retry_task = self.start_background(self.retry_upstream(upstream, delay))
+
+    async def retry_upstream(self, upstream: Upstream, delay: float):
+        """
+        Wait, then rediscover a failed upstream.
+
+        Args:
+            upstream: The upstream to retry.
+            delay: Seconds to wait first.
+        """
+        await asyncio.sleep(delay)
+        upstream.retry_task = None
+        await self.refresh_upstream(upstream, publish=True)
+
+    async def refresh_catalog(self) -> bool:
+        """
+        Rediscover every upstream and publish the catalog if it changed.
+
+        Returns:
+            True if the catalog changed and clients were notified.
+        """
+        await asyncio.gather(*(self.refresh_upstream(upstream) for upstream in self.upstreams.values()))
+        return await self.publish_catalog()
+
+    async def publish_catalog(self, force: bool = False) -> bool:
+        """
+        Merge the upstreams' tools into a new catalog and swap it in if it changed.
+
+        Args:
+            force: Swap in the catalog even if its tools did not change, for
+                example because the gateway options changed.
+
+        Returns:
+            True if the catalog changed and clients were notified.
+        """
+        voitta_tools = [
+            tool
+            for upstream in self.upstreams.values() if upstream.tools
+            for tool in upstream.tools
+        ]
+        catalog = ToolCatalog(voitta_tools, self.catalog, self.validation_modes())
+        if not force and catalog.fingerprint == self.catalog.fingerprint:
+            return False
+
+        self.set_catalog(catalog)
+        logger.info(f"Catalog changed, now serving {len(catalog)} tools")
+        if self.snapshot_path:
+            try:
+                await asyncio.to_thread(save_snapshot, self.snapshot_path, catalog.voitta_tools)
+            except Exception as e:
+                logger.warning(f"Failed to save catalog snapshot: {e}")
+
+        await self.notify_tools_changed()
+        return True
+
+    def validation_modes(self) -> Dict[str, str]:
+        """
+        Get the argument validation mode of every upstream.
+
+        Returns:
+            Mapping of upstream names to validation modes.
+        """
+        return {name: upstream.validation_mode for name, upstream in self.upstreams.items()}
+
+    def set_catalog(self, catalog: ToolCatalog):
+        """
+        Make a catalog current and bring derived indexes up to date.
+
+        Args:
+            catalog: The new catalog.
+        """
+        self.catalog = catalog
+        self._policies.clear()
+        for full_name in [name for name in self._tool_limiters if catalog.resolve(name) is None]:
+            del self._tool_limiters[full_name]
+        for full_name in [name for name in self._latencies if catalog.resolve(name) is None]:
+            del self._latencies[full_name]
+        if self.search_index is not None:
+            indexed, removed = self.search_index.update(catalog)
+            logger.info(f"Search index updated: {indexed} tools indexed, {removed} removed")
+
+        # Build the list_tools response now rather than on the first request
+        self.listed_tools()
+
+    def setup_meta_tools(self):
+        """Register the built-in tools enabled in the gateway configuration."""
+        self.meta_tools.clear()
+        self.search_index = None
+        self.meta_tools[TOOL_INFO_TOOL.name] = (TOOL_INFO_TOOL, self.get_tool_info)
+        if self.config.get("search_tools", {}).get("enabled", False):
+            self.search_index = ToolSearchIndex()
+            self.meta_tools[SEARCH_TOOL.name] = (SEARCH_TOOL, self.search_tools)
+        if self.config.get("batch_call", {}).get("enabled", False):
+            self.meta_tools[BATCH_CALL_TOOL.name] = (BATCH_CALL_TOOL, self.batch_call)
+
+    def listed_tools(self) -> List[types.Tool]:
+        """
+        Get the tools returned by list_tools, sorted by name.
+
+        In slim mode tools are listed with short descriptions and minimal
+        schemas; get_voitta_tool_info returns the full definition. With tool
+        search enabled only the configured core tools are listed; every other
+        tool remains callable and can be found with search_tools.
+
+        Returns:
+            The listed tools, including enabled built-in tools.
+        """
+        listed_catalog, tools = self._listed
+        catalog = self.catalog
+        if listed_catalog is catalog:
+            return tools
+
+        slim_settings = self.config.get("slim_catalog", {})
+        if slim_settings.get("enabled", False):
+            tools = catalog.slim_mcp_tools(slim_settings.get("description_length", 120))
+        else:
+            tools = catalog.mcp_tools
+
+        if self.search_index is not None:
+            core_tools = self.config.get("search_tools", {}).get("core_tools", [])
+            tools = [
+                tool for tool in tools
+                if any(fnmatch.fnmatchcase(tool.name, pattern) for pattern in core_tools)
+            ]
+
+        list_mode = self.config.get("circuit_breaker", {}).get("list_mode", "show")
+        if list_mode != "show":
+            tools = self.apply_availability(catalog, tools, list_mode)
+
+        if self.meta_tools:
+            tools = sorted(tools + [tool for tool, _ in self.meta_tools.values()], key=lambda tool: tool.name)
+
+        self._listed = (catalog, tools)
+        return tools
+
+    def callable_tools(self) -> List[types.Tool]:
+        """
+        Get every callable tool, for the MCP SDK's tool cache.
+
+        The SDK looks up the definition of every called tool and, when the
+        name is missing from its cache, refills the cache by calling the
+        list_tools handler without a request. Tools that are not listed,
+        such as those found with search_tools, tools past the first page
+        and full names, are included here with their full schemas, so the
+        cache is filled once per catalog rather than on every such call.
+
+        Returns:
+            The catalog's tools under their exposed and full names, and the
+            built-in tools.
+        """
+        callable_catalog, tools = self._callable
+        catalog = self.catalog
+        if callable_catalog is catalog:
+            return tools
+
+        tools = list(catalog.mcp_tools)
+        # Shallow copies under the full name share the schema
+        tools.extend(
+            to_mcp_tool(entry).model_copy(update={"name": entry.full_name})
+            for entry in catalog
+            if entry.full_name != entry.name
+        )
+        tools.extend(tool for tool, _ in self.meta_tools.values())
+        self._callable = (catalog, tools)
+        return tools
+
+    def apply_availability(self, catalog: ToolCatalog, tools: List[types.Tool], list_mode: str) -> List[types.Tool]:
+        """
+        Hide or annotate the tools of upstreams whose circuit is open.
+
+        Args:
+            catalog: The catalog the tools were built from.
+            tools: The tools to list.
+            list_mode: ``hide`` to leave the tools out, ``annotate`` to mark
+                them as unavailable in their description.
+
+        Returns:
+            The tools to list.
+        """
+        unavailable = {
+            name for name, upstream in self.upstreams.items()
+            if upstream.breaker is not None and not upstream.breaker.available
+        }
+        if not unavailable:
+            return tools
+
+        listed = []
+        for tool in tools:
+            entry = catalog.resolve(tool.name)
+            if entry is None or entry.upstream not in unavailable:
+                listed.append(tool)
+            elif list_mode == "annotate":
+                description = f"[Temporarily unavailable] {tool.description or ''}".rstrip()
+                listed.append(tool.model_copy(update={"description": description}))
+        return listed
+
+    def breaker_changed(self, upstream: Upstream, previous: str, state: str):
+        """
+        React to a change of an upstream's circuit state.
+
+        Args:
+            upstream: The upstream whose circuit changed.
+            previous: The previous state.
+            state: The new state.
+        """
+        if upstream.retired:
+            return
+
+        list_mode = self.config.get("circuit_breaker", {}).get("list_mode", "show")
+        if list_mode != "show" and (previous == OPEN) != (state == OPEN):
+            # Rebuild the listed tools on the next request and tell clients
+            self._listed = (None, [])
+            self.start_background(self.notify_tools_changed())
+
+    async def get_tool_info(self, arguments: Dict[str, Any]) -> List[types.TextContent]:
+        """
+        Handle a call to the get_voitta_tool_info built-in tool.
+
+        Args:
+            arguments: The tool arguments, with ``tool_name``.
+
+        Returns:
+            The full definition of the tool as JSON.
+        """
+        tool_name = str(arguments.get("tool_name", ""))
+        entry = self.resolve_tool(tool_name)
+        if entry is None:
+            return [types.TextContent(text=f"Error: Tool {tool_name} not found", type="text")]
+
+        info = {
+            "name": entry.name,
+            "full_name": entry.full_name,
+            "description": entry.description,
+            "inputSchema": entry.input_schema,
+        }
+        return [types.TextContent(text=self.serializer.dumps(info), type="text")]
+
+    async def search_tools(self, arguments: Dict[str, Any]) -> List[types.TextContent]:
+        """
+        Handle a call to the search_tools built-in tool.
+
+        Args:
+            arguments: The tool arguments, with ``query`` and optional ``limit``,
+                which is clamped to ``1..max_results``.
+
+        Returns:
+            A JSON list of the matching tools, or an error if ``limit`` is
+            not a number.
+        """
+        search_settings = self.config.get("search_tools", {})
+        max_results = max(1, int(search_settings.get("max_results", 10)))
+        limit = arguments.get("limit")
+        if limit is None:
+            limit = max_results
+        else:
+            try:
+                if isinstance(limit, bool):
+                    raise TypeError(limit)
+                limit = int(limit)
+            except (TypeError, ValueError, OverflowError):
+                return [types.TextContent(text=f"Error: limit must be a number, got {limit!r}", type="text")]
+            # At least one result, and no more than the configured maximum
+            limit = min(max(limit, 1), max_results)
+
+        catalog = self.catalog
+        results = []
+        for full_name, score in self.search_index.search(str(arguments.get("query", "")), limit):
+            entry = catalog.resolve(full_name)
+            if entry is not None:
+                results.append({
+                    "name": entry.name,
+                    "description": entry.description,
+                    "inputSchema": entry.input_schema,
+                })
+
+        return [types.TextContent(text=self.serializer.dumps(results), type="text")]
+
+    async def batch_call(self, arguments: Dict[str, Any]) -> List[Any]:
+        """
+        Handle a call to the batch_call built-in tool.
+
+        The calls run concurrently, at most ``batch_call.max_concurrent`` at
+        a time, and each goes through the same limits, caching and deadlines
+        as a single call.
+
+        Args:
+            arguments: The tool arguments, with the list of ``calls``.
+
+        Returns:
+            A JSON list with the tool, status and result or error of every
+            call, in order. Content other than text, such as images, follows
+            the list; each result names the indices of its items.
+        """
+        settings = self.config.get("batch_call", {})
+        calls = arguments.get("calls")
+        if not isinstance(calls, list) or not calls:
+            return [types.TextContent(text="Error: calls must be a non-empty list", type="text")]
+        max_calls = settings.get("max_calls", 20)
+        if len(calls) > max_calls:
+            return [types.TextContent(text=f"Error: At most {max_calls} calls can be batched", type="text")]
+
+        semaphore = asyncio.Semaphore(settings.get("max_concurrent", 8))
+
+        async def call_one(call: Any) -> Tuple[str, Any]:
+            if not isinstance(call, dict) or not isinstance(call.get("tool"), str):
+                raise ToolCallError("Each call needs a tool name")
+            name = call["tool"]
+            call_arguments = call.get("arguments") or {}
+            if not isinstance(call_arguments, dict):
+                raise ToolCallError(f"Arguments for tool {name} must be an object")
+            if name == BATCH_CALL_TOOL.name:
+                raise ToolCallError("Batches cannot be nested")
+
+            async with semaphore:
+                meta_tool = self.meta_tools.get(name)
+                if meta_tool is None:
+                    return await self.call_tool(name, call_arguments, report_progress=False)
+                content = await meta_tool[1](call_arguments)
+                # The built-in tools report errors as text
+                if len(content) == 1 and content[0].text.startswith("Error: "):
+                    raise ToolCallError(content[0].text[len("Error: "):])
+                return content
+
+        outcomes = await asyncio.gather(*(call_one(call) for call in calls), return_exceptions=True)
+
+        results = []
+        attachments: List[Any] = []
+        for call, outcome in zip(calls, outcomes):
+            item: Dict[str, Any] = {"tool": call.get("tool") if isinstance(call, dict) else None}
+            if isinstance(outcome, asyncio.CancelledError):
+                raise outcome
+            if isinstance(outcome, BaseException):
+                if not isinstance(outcome, ToolCallError):
+                    logger.error(f"Error calling tool {item['tool']} in batch: {outcome}")
+                item["status"] = "error"
+                item["error"] = str(outcome)
+            else:
+                texts = [content.text for content in outcome if isinstance(content, types.TextContent)]
+                others = [content for content in outcome if not isinstance(content, types.TextContent)]
+                item["status"] = "ok"
+                item["result"] = "\n".join(texts)
+                if others:
+                    # Indices in the response's content list, after the JSON list
+                    item["content"] = list(range(len(attachments) + 1, len(attachments) + 1 + len(others)))
+                    attachments.extend(others)
+            results.append(item)
+
+        return [types.TextContent(text=self.serializer.dumps(results), type="text")] + attachments
+
+    def start_refresh_loop(self):
+        """Start refreshing the catalog periodically, if configured."""
+        self._refresh_task = None
+        refresh_interval = self.config.get("refresh_interval", 0)
+        if refresh_interval > 0:
+            self._refresh_task = self.start_background(
+                self.refresh_loop(refresh_interval, self.config.get("refresh_jitter", 0.1))
+            )
+
+    async def refresh_loop(self, interval: float, jitter: float):
+        """
+        Periodically refresh the catalog.
+
+        Args:
+            interval: Seconds between refreshes.
+            jitter: Fraction of the interval to randomize each delay by.
+        """
+        while True:
+            await asyncio.sleep(interval * (1 + random.uniform(-jitter, jitter)))
+            try:
+                await self.refresh_catalog()
+            except Exception as e:
+                logger.error(f"Catalog refresh failed: {e}")
+
+    async def notify_tools_changed(self):
+        """Send tools/list_changed to every session that listed tools."""
+        for session in list(self._sessions):
+            try:
+                await session.send_tool_list_changed()
+            except Exception as e:
+                logger.warning(f"Failed to send tools/list_changed: {e}")
+
+    async def call_upstream(
+        self,
+        upstream: Upstream,
+        voitta_router: VoittaRouter,
+        entry: CatalogEntry,
+        arguments: Dict[str, Any],
+        requested_timeout: Optional[float] = None,
+    ) -> Any:
+        """
+        Call a tool on its upstream within the call's deadline.
+
+        Args:
+            upstream: The upstream providing the tool.
+            voitta_router: The upstream's current router.
+            entry: The tool's catalog entry.
+            arguments: The call arguments.
+            requested_timeout: Deadline in seconds requested by the client, if any.
+
+        Returns:
+            The raw result returned by the router.
+
+        Raises:
+            TimeoutError: If the call did not complete before its deadline.
+        """
+        policy = self._policies.get(entry.full_name)
+        if policy is None:
+            policy = self._policies[entry.full_name] = upstream.tool_policy(entry.short_name, entry.full_name)
+
+        timeout = policy.deadline(requested_timeout)
+        if timeout is None:
+            return await self.call_shared(upstream, voitta_router, entry, policy, arguments)
+
+        # The deadline covers waiting for a slot as well as the call itself
+        reached: List[float] = []
+        token = upstream_reached.set(reached)
+        try:
+            return await asyncio.wait_for(
+                self.call_shared(upstream, voitta_router, entry, policy, arguments), timeout
+            )
+        except asyncio.TimeoutError:
+            # Only the configured deadline says the upstream is too slow; a client
+            # asking for less must not open the circuit for every session. Time spent
+            # queueing behind local limits does not count against the upstream either.
+            configured = policy.timeout
+            if upstream.breaker is not None and reached and configured is not None and timeout >= configured:
+                upstream.breaker.record(False, time.monotonic() - reached[0])
+            raise TimeoutError(f"Tool {entry.name} did not complete within {timeout}s") from None
+        finally:
+            upstream_reached.reset(token)
+
+    async def call_shared(
+        self,
+        upstream: Upstream,
+        voitta_router: VoittaRouter,
+        entry: CatalogEntry,
+        policy: ToolPolicy,
+        arguments: Dict[str, Any],
+    ) -> Any:
+        """
+        Call a tool, sharing results between identical calls where allowed.
+
+        Cacheable tools are served from the result cache, and identical
+        concurrent calls to idempotent tools share a single upstream call.
+
+        Args:
+            upstream: The upstream providing the tool.
+            voitta_router: The upstream's current router.
+            entry: The tool's catalog entry.
+            policy: The tool's call policy.
+            arguments: The call arguments.
+
+        Returns:
+            The raw result returned by the router.
+        """
+        local_name = upstream.local_name(voitta_router, entry.full_name)
+        if not policy.idempotent:
+            return await self.call_limited(upstream, voitta_router, entry, policy, local_name, arguments)
+
+        call_key = ResultCache.key(entry.full_name, arguments, upstream.source_digest)
+        if policy.cache_ttl is not None:
+            result = self.result_cache.get(call_key)
+            if result is not MISS:
+                logger.debug(f"Result cache hit for {entry.full_name}")
+                return result
+
+        async def call():
+            result = await self.call_resilient(upstream, voitta_router, entry, policy, local_name, arguments)
+            if policy.cache_ttl is not None and is_success(result):
+                self.result_cache.put(call_key, result, policy.cache_ttl)
+            return result
+
+        return await self.single_flight.do(call_key, call)
+
+    async def call_resilient(
+        self,
+        upstream: Upstream,
+        voitta_router: VoittaRouter,
+        entry: CatalogEntry,
+        policy: ToolPolicy,
+        local_name: str,
+        arguments: Dict[str, Any],
+    ) -> Any:
+        """
+        Call an idempotent tool with its retry and hedging policy.
+
+        A hedge is started once a call has taken longer than the configured
+        percentile of the tool's recent latencies. Every attempt, hedge or
+        retry is subject to the concurrency limits and the circuit breaker.
+
+        Args:
+            upstream: The upstream providing the tool.
+            voitta_router: The upstream's current router.
+            entry: The tool's catalog entry.
+            policy: The tool's call policy.
+            local_name: The router-local function name.
+            arguments: The call arguments.
+
+        Returns:
+            The raw result returned by the router.
+        """
+        if policy.retry is None and policy.hedging is None:
+            return await self.call_limited(upstream, voitta_router, entry, policy, local_name, arguments)
+
+        latencies = self._latencies.get(entry.full_name)
+        if latencies is None:
+            latencies = self._latencies[entry.full_name] = LatencyTracker()
+
+        async def attempt():
+            start = time.monotonic()
+            result = await self.call_limited(upstream, voitta_router, entry, policy, local_name, arguments)
+            if is_success(result):
+                latencies.record(time.monotonic() - start)
+            return result
+
+        async def hedged():
+            hedging = policy.hedging
+            if hedging is None:
+                return await attempt()
+            delay = latencies.percentile(hedging["percentile"], hedging["min_samples"])
+            if delay is not None:
+                delay = max(delay, hedging["min_delay"])
+            return await self.resilience.hedge(attempt, delay, hedging["max_hedges"])
+
+        if policy.retry is None:
+            return await hedged()
+        return await self.resilience.retry(hedged, **policy.retry)
+
+    async def call_limited(
+        self,
+        upstream: Upstream,
+        voitta_router: VoittaRouter,
+        entry: CatalogEntry,
+        policy: ToolPolicy,
+        local_name: str,
+        arguments: Dict[str, Any],
+    ) -> Any:
+        """
+        Call a tool once a slot is free under its own and its upstream's limits.
+
+        Calls to an upstream whose circuit is open fail immediately.
+
+        Args:
+            upstream: The upstream providing the tool.
+            voitta_router: The upstream's current router.
+            entry: The tool's catalog entry.
+            policy: The tool's call policy.
+            local_name: The router-local function name.
+            arguments: The call arguments.
+
+        Returns:
+            The raw result returned by the router.
+
+        Raises:
+            OverloadedError: If a limit's queue is full or the wait timed out.
+            CircuitOpenError: If the upstream's circuit is open.
+        """
+        breaker = upstream.breaker
+        if breaker is not None:
+            breaker.check()
+
+        tool_limiter = None
+        if policy.concurrency is not None:
+            tool_limiter = self._tool_limiters.get(entry.full_name)
+            if tool_limiter is None or not tool_limiter.matches(policy.concurrency):
+                tool_limiter = ConcurrencyLimiter.from_settings(entry.name, policy.concurrency)
+                if tool_limiter is not None:
+                    self._tool_limiters[entry.full_name] = tool_limiter
+                else:
+                    self._tool_limiters.pop(entry.full_name, None)
+
+        async with contextlib.AsyncExitStack() as slots:
+            # Queue for the tool first, so waiting calls do not hold upstream slots
+            for limiter in (tool_limiter, upstream.limiter):
+                if limiter is not None:
+                    await slots.enter_async_context(limiter.slot())
+            if breaker is None:
+                return await self.call_router(voitta_router, local_name, arguments)
+            with breaker.guard() as guarded:
+                reached = upstream_reached.get()
+                if reached is not None and not reached:
+                    reached.append(time.monotonic())
+                result = await self.call_router(voitta_router, local_name, arguments)
+                # Voitta reports most upstream failures as results rather than exceptions
+                guarded.success = is_success(result)
+                return result
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Collect the gateway's runtime statistics.
+
+        Returns:
+            Dictionary with result cache, call coalescing, concurrency
+            limiter, circuit breaker, retry, hedging and spilled result
+            statistics.
+        """
+        return {
+            "result_cache": self.result_cache.cache_info(),
+            "single_flight": {
+                "calls": self.single_flight.calls,
+                "coalesced": self.single_flight.coalesced,
+                "in_flight": len(self.single_flight),
+            },
+            "upstreams": {
+                name: {
+                    "concurrency": upstream.limiter.stats() if upstream.limiter is not None else None,
+                    "circuit": upstream.breaker.stats() if upstream.breaker is not None else None,
+                }
+                for name, upstream in self.upstreams.items()
+                if upstream.limiter is not None or upstream.breaker is not None
+            },
+            "tools": {
+                full_name: limiter.stats()
+                for full_name, limiter in sorted(self._tool_limiters.items())
+                if limiter is not None
+            },
+            "resilience": self.resilience.stats(),
+            "large_results": self.result_store.stats(),
+        }
+
+    async def stats_loop(self):
+        """Periodically log the gateway's statistics."""
+        while True:
+            interval = self.config.get("stats_interval", 0)
+            if interval <= 0:
+                return
+            await asyncio.sleep(interval)
+            logger.info(f"Gateway statistics: {self.serializer.dumps(self.stats())}")
+
+    async def call_router(self, voitta_router: VoittaRouter, full_name: str, arguments: Dict[str, Any]) -> Any:
+        """
+        Call a function on a router, tracking it as in flight.
+
+        Args:
+            voitta_router: The router that owns the function.
+            full_name: The prefixed Voitta function name.
+            arguments: The function arguments.
+
+        Returns:
+            The raw result returned by the router.
+        """
+        self._inflight[voitta_router] = self._inflight.get(voitta_router, 0) + 1
+        try:
+            return await call_function(voitta_router, full_name, arguments)
+        finally:
+            self._inflight[voitta_router] -= 1
+            if not self._inflight[voitta_router]:
+                del self._inflight[voitta_router]
+                if voitta_router in self._drained:
+                    self._drained[voitta_router].set()
+
+    async def retire_router(self, voitta_router: Optional[VoittaRouter]):
+        """
+        Close a replaced router once its in-flight calls have completed.
+
+        Args:
+            voitta_router: The router that is no longer current.
+        """
+        if voitta_router is None:
+            return
+        if voitta_router in self._inflight:
+            drained = self._drained.setdefault(voitta_router, asyncio.Event())
+            await drained.wait()
+            del self._drained[voitta_router]
+        await close_router(voitta_router)
+
+    def start_background(self, coro) -> asyncio.Task:
+        """
+        Run a coroutine as a background task owned by the server.
+
+        Args:
+            coro: The coroutine to run.
+
+        Returns:
+            The created task.
+        """
+        task = asyncio.create_task(coro)
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+        return task
+
+    def requested_timeout(self) -> Optional[float]:
+        """
+        Get the deadline the client requested for the current call.
+
+        Clients request a deadline with a ``timeout`` in seconds in the
+        request's ``_meta``.
+
+        Returns:
+            The requested deadline in seconds, or None.
+        """
+        meta = self.server.request_context.meta
+        timeout = getattr(meta, "timeout", None) if meta is not None else None
+        if timeout is None:
+            return None
+        if isinstance(timeout, bool) or not isinstance(timeout, (int, float)) or timeout <= 0:
+            logger.warning(f"Ignoring invalid _meta.timeout: {timeout!r}")
+            return None
+        return float(timeout)
+
+    def progress_stream(self, upstream: Upstream) -> Optional[ProgressStream]:
+        """
+        Get the progress stream for the current call, if progress applies.
+
+        Progress is reported when ``streaming.enabled`` is set and the client
+        sent a ``progressToken`` in the request's ``_meta``.
+
+        Args:
+            upstream: The upstream serving the call.
+
+        Returns:
+            The stream, or None.
+        """
+        settings = upstream.config.get("streaming", {})
+        if not settings.get("enabled", False):
+            return None
+
+        context = self.server.request_context
+        progress_token = getattr(context.meta, "progressToken", None) if context.meta is not None else None
+        if progress_token is None:
+            return None
+        return ProgressStream(
+            context.session,
+            progress_token,
+            context.request_id,
+            settings.get("heartbeat_interval", 0),
+        )
+
+    async def spill_large_results(self, content: List[Any]) -> List[Any]:
+        """
+        Replace text too large to return inline with a preview and a resource URI.
+
+        Text larger than ``large_results.max_inline_size`` bytes is stored
+        in the result store. It is replaced by its first ``preview_size``
+        bytes and a note naming the resource that holds the full text.
+
+        Args:
+            content: The result's content items.
+
+        Returns:
+            The content, with large text items replaced.
+        """
+        settings = self.config.get("large_results", {})
+        max_inline_size = settings.get("max_inline_size", 0)
+        if max_inline_size <= 0:
+            return content
+
+        spilled_content = []
+        for item in content:
+            # UTF-8 takes at most 4 bytes per character, so short text needs no encoding
+            if not isinstance(item, types.TextContent) or len(item.text) * 4 <= max_inline_size:
+                spilled_content.append(item)
+                continue
+            data = item.text.encode("utf-8")
+            if len(data) <= max_inline_size:
+                spilled_content.append(item)
+                continue
+
+            result = await self.result_store.put(data)
+            preview_size = min(settings.get("preview_size", 4096), max_inline_size)
+            preview = data[:preview_size].decode("utf-8", errors="ignore")
+            spilled_content.append(types.TextContent(
+                type="text",
+                text=(
+                    f"{preview}\n\n[Result truncated: showing the first {len(preview.encode('utf-8'))} "
+                    f"of {result.size} bytes. Read the full result from the resource {result.uri}, "
+                    f"in pages selected with ?bytes=START-END or ?lines=START-END.]"
+                ),
+            ))
+        return spilled_content
+
+    async def binary_result(self, data: Union[bytes, str], mime_type: str) -> Any:
+        """
+        Convert a binary result to MCP content.
+
+        Results larger than ``large_results.max_inline_size`` bytes are
+        stored in the result store and replaced by a note naming the resource.
+
+        Args:
+            data: The result's bytes, or base64 text.
+            mime_type: The result's MIME type.
+
+        Returns:
+            The content item.
+        """
+        max_inline_size = self.config.get("large_results", {}).get("max_inline_size", 0)
+        size = decoded_size(data)
+        if 0 < max_inline_size < size:
+            result = await self.result_store.put(to_bytes(data), mime_type)
+            return types.TextContent(
+                type="text",
+                text=(
+                    f"[Binary result of {size} bytes ({mime_type}). Read it from the resource "
+                    f"{result.uri}, in pages selected with ?bytes=START-END.]"
+                ),
+            )
+        return binary_content(data, mime_type)
+
+    async def call_tool(self, name: str, arguments: Dict[str, Any], report_progress: bool = True) -> List[Any]:
+        """
+        Call an upstream tool and convert its result to MCP content.
+
+        Args:
+            name: The name of the tool to call.
+            arguments: The arguments to pass to the tool.
+            report_progress: Whether the call may report progress to the
+                client while it waits for the upstream.
+
+        Returns:
+            List of content items representing the result of the tool call.
+
+        Raises:
+            ToolCallError: If the tool is unknown or unavailable, or the
+                arguments are invalid.
+            Exception: Whatever the upstream call raised.
+        """
+        # Find the full tool name with prefix
+        entry = self.resolve_tool(name)
+        if entry is None and not self._discovered.is_set():
+            # The tool may belong to an upstream that is still being discovered
+            await self.wait_for_event(self._discovered)
+            entry = self.resolve_tool(name)
+
+        if entry is None:
+            logger.error(f"Tool {name} not found")
+            raise ToolCallError(f"Tool {name} not found")
+
+        # Reject invalid arguments before spending an upstream call on them
+        errors = validate_arguments(entry.validator, arguments)
+        if errors is not None:
+            logger.info(f"Invalid arguments for tool {name}: {errors}")
+            raise ToolCallError(f"Invalid arguments for tool {name}\n{self.serializer.dumps({'errors': errors})}")
+
+        upstream = self.upstreams.get(entry.upstream)
+        if upstream is not None and upstream.router is None and not self._discovered.is_set():
+            await self.wait_for_event(self._discovered)
+
+        voitta_router = upstream.router if upstream is not None else None
+        if voitta_router is None:
+            logger.error(f"Upstream {entry.upstream} for tool {name} is unavailable")
+            raise ToolCallError(f"Tool {name} is currently unavailable")
+
+        # Call the tool through the upstream's Voitta router
+        stream = self.progress_stream(upstream) if report_progress else None
+        call = self.call_upstream(upstream, voitta_router, entry, arguments, self.requested_timeout())
+        result = await (call if stream is None else stream.wait(call, upstream.name))
+
+        # Convert the result to MCP format
+        payload = binary_payload(result)
+        if payload is not None and payload[1] == "text/plain":
+            # Bytes holding UTF-8 text
+            result, payload = to_bytes(payload[0]).decode("utf-8"), None
+
+        if payload is not None:
+            # Binary result, passed as an image or embedded resource
+            content = [await self.binary_result(*payload)]
+        elif isinstance(result, str):
+            # Text result, or an MCP server's result carrying images or resources
+            content = (mcp_content(result) if upstream.router_namespace == "mcp" else None) or [
+                types.TextContent(text=str(result), type="text")
+            ]
+        elif isinstance(result, dict) or isinstance(result, list):
+            # JSON result
+            content = [types.TextContent(text=self.serializer.dumps(result), type="text")]
+        else:
+            # Unknown result type, convert to string
+            content = [types.TextContent(text=str(result), type="text")]
+
+        return await self.spill_large_results(content)
+
+    def resolve_tool(self, name: str) -> Optional[CatalogEntry]:
+        """
+        Resolve a tool name sent by a client to its catalog entry.
+
+        The catalog only changes through discovery or a reload, so a lookup
+        in its name index answers known and unknown names alike.
+
+        Args:
+            name: The tool name sent by the client.
+
+        Returns:
+            The matching catalog entry, or None if the tool does not exist.
+        """
+        return self.catalog.resolve(name)
+
     def setup_handlers(self):
         """Set up the MCP request handlers."""
         
         @self.server.list_tools()
-        async def handle_list_tools() -> List[types.Tool]:
+        async def handle_list_tools(request: types.ListToolsRequest) -> types.ListToolsResult:
             """
             Handle a request to list available tools.
+
+            Args:
+                request: The list request; its cursor selects the page. None
+                    when the MCP SDK refills its tool cache for a call.
             
             Returns:
-                List of Tool objects representing the available Voitta tools.
+                One page of Tool objects representing the available Voitta tools.
             """
+            if request is None:
+                # Not a client request: hand the SDK every callable tool at once
+                return types.ListToolsResult(tools=self.callable_tools())
 
             logger.info("list_tools()")
+            self._sessions.add(self.server.request_context.session)
 
-            if not self.voitta_router:
+            if self.config is None:
                 logger.error("Voitta router not initialized")
-                return []
-            
-            # Get tools from the Voitta router
-            voitta_tools = self.voitta_router.get_tools()
-            
+                return types.ListToolsResult(tools=[])
+
+            cursor = request.params.cursor if request is not None and request.params else None
             
+            # Tool objects are converted once per catalog and reused
+            try:
+                tools, next_cursor = list_page(self.listed_tools(), cursor, self.config.get("list_page_size", 0))
+            except ValueError as e:
+                raise McpError(types.ErrorData(code=types.INVALID_PARAMS, message=str(e)))
+            return types.ListToolsResult(tools=tools, nextCursor=next_cursor)
 
-            # Convert Voitta tools to MCP Tool objects
-            mcp_tools = []
-            for tool in voitta_tools:
-                # Extract tool information from the function object
-                function_info = tool.get("function", {})
-                tool_name = function_info.get("name", "").split("____")[-1]  # Get the actual function name without prefix
-                tool_description = function_info.get("description", "")
-                tool_parameters = function_info.get("parameters", {})
-                
-                logger.info(f"tool: {tool_name}")
+        @self.server.list_resources()
+        async def handle_list_resources() -> List[types.Resource]:
+            """
+            List the spilled results that can be read.
 
-                # Log the tool parameters for debugging
-                logger.info(f"tool_parameters before: {json.dumps(tool_parameters, indent=2)}")
-                
-                # Create a proper JSON Schema for the input_schema
-                # Ensure it has the required 'type' field and other required fields
-                input_schema = {
-                    "type": "object",
-                    "properties": {},
-                    "required": []
-                }
-                
-                # If tool_parameters already has the correct structure, use it
-                if isinstance(tool_parameters, dict):
-                    if 'type' in tool_parameters:
-                        input_schema = tool_parameters
-                    elif 'properties' in tool_parameters:
-                        input_schema['properties'] = tool_parameters.get('properties', {})
-                        input_schema['required'] = tool_parameters.get('required', [])
-                    else:
-                        # If it's a flat dictionary, convert it to properties
-                        for key, value in tool_parameters.items():
-                            if key not in ['type', 'properties', 'required']:
-                                input_schema['properties'][key] = value
-                
-                logger.info(f"input_schema after: {json.dumps(input_schema, indent=2)}")
-                
-                # Create MCP Tool object
-                mcp_tool = types.Tool(
-                    name=tool_name,
-                    description=tool_description,
-                    inputSchema=input_schema
+            Returns:
+                One resource per stored result.
+            """
+            return [
+                types.Resource(
+                    uri=result.uri,
+                    name=f"result-{result.id}",
+                    description="Tool result too large to return inline",
+                    mimeType=result.mime_type,
+                    size=result.size,
                 )
+                for result in self.result_store.results()
+            ]
 
-                logger.info(f"mcp_tool: {mcp_tool}")
+        @self.server.read_resource()
+        async def handle_read_resource(uri) -> List[ReadResourceContents]:
+            """
+            Read a page of a spilled result.
 
-                mcp_tools.append(mcp_tool)
-            
-            logger.info(f"{mcp_tools}")
+            Args:
+                uri: The result URI, optionally with a byte or line range.
 
-            return mcp_tools
+            Returns:
+                The text or bytes of the page, with the range read, the total size and
+                the URI of the next page in ``_meta``.
+            """
+            page_size = self.config.get("large_results", {}).get("page_size", PAGE_SIZE) if self.config else PAGE_SIZE
+            try:
+                result, text, meta = self.result_store.read(str(uri), page_size)
+            except KeyError as e:
+                raise McpError(types.ErrorData(code=RESOURCE_NOT_FOUND, message=str(e.args[0])))
+            except ValueError as e:
+                raise McpError(types.ErrorData(code=types.INVALID_PARAMS, message=str(e)))
+            return [ReadResourceContents(content=text, mime_type=result.mime_type, meta=meta)]
 
-        @self.server.call_tool()
+        # Arguments are checked against the catalog's precompiled validators
+        @self.server.call_tool(validate_input=False)
         async def handle_call_tool(
             name: str, arguments: Dict[str, Any] | None
         ) -> List[types.TextContent | types.ImageContent | types.EmbeddedResource]:
@@ -166,61 +1491,70 @@ class VoittaMcpServer:
             Returns:
                 List of content items representing the result of the tool call.
             """
-            if not self.voitta_router:
+            # Built-in tools are handled by the gateway itself
+            meta_tool = self.meta_tools.get(name)
+            if meta_tool is not None:
+                return await meta_tool[1](arguments or {})
+
+            if self.config is None:
                 logger.error("Voitta router not initialized")
-                return [types.TextContent(text="Error: Voitta router not initialized")]
+                return [types.TextContent(text="Error: Voitta router not initialized", type="text")]
             
             try:
-                # Find the full tool name with prefix
-                full_tool_name = None
-                for tool in self.voitta_router.get_tools():
-                    function_name = tool.get("function", {}).get("name", "")
-                    if function_name.endswith(f"____{name}"):
-                        full_tool_name = function_name
-                        break
-                
-                if not full_tool_name:
-                    logger.error(f"Tool {name} not found")
-                    return [types.TextContent(text=f"Error: Tool {name} not found")]
-                
-                # Call the tool through the Voitta router
-                # Using empty strings for token and oauth_token as they're not needed for this implementation
-                result = await self.voitta_router.call_function(full_tool_name, arguments or {}, "", "")
-                
-                # Convert the result to MCP format
-                if isinstance(result, str):
-                    # Text result
-                    return [types.TextContent(text=str(result), type="text")]
-                elif isinstance(result, dict) or isinstance(result, list):
-                    # JSON result
-                    return [types.TextContent(text=json.dumps(result, indent=2), type="text")]
-                else:
-                    # Unknown result type, convert to string
-                    return [types.TextContent(text=str(result), type="text")]
-                
+                # A client cancelling the request cancels this task and the upstream call
+                return await self.call_tool(name, arguments or {})
+            except ToolCallError as e:
+                return [types.TextContent(text=f"Error: {e}", type="text")]
             except Exception as e:
                 logger.error(f"Error calling tool {name}: {e}")
                 return [types.TextContent(text=f"Error calling tool {name}: {str(e)}", type="text")]
 
     async def run(self):
         """Run the MCP server."""
+        # Keep router output off the transport before any router is created
+        transport_stdout = claim_stdout()
+
         # Initialize the Voitta router
         await self.initialize()
+
+        self.start_refresh_loop()
+
+        # Pick up configuration changes without restarting
+        self.start_background(self.watch_config())
+        self.start_background(self.stats_loop())
+        if hasattr(signal, "SIGHUP"):
+            try:
+                asyncio.get_running_loop().add_signal_handler(
+                    signal.SIGHUP, lambda: self.start_background(self.reload_config())
+                )
+            except (NotImplementedError, RuntimeError) as e:
+                logger.warning(f"Cannot reload the configuration on SIGHUP: {e}")
         
         # Run the server
-        async with mcp.server.stdio.stdio_server() as (read_stream, write_stream):
-            await self.server.run(
+        try:
+            async with mcp.server.stdio.stdio_server(stdout=anyio.wrap_file(transport_stdout)) as (
                 read_stream,
                 write_stream,
-                InitializationOptions(
-                    server_name="voitta-gateway",
-                    server_version="0.1.0",
-                    capabilities=self.server.get_capabilities(
-                        notification_options=NotificationOptions(),
-                        experimental_capabilities={},
+            ):
+                await self.server.run(
+                    read_stream,
+                    write_stream,
+                    InitializationOptions(
+                        server_name="voitta-gateway",
+                        server_version="0.1.0",
+                        capabilities=self.server.get_capabilities(
+                            notification_options=NotificationOptions(tools_changed=True),
+                            experimental_capabilities={},
+                        ),
                     ),
-                ),
-            )
+                )
+        finally:
+            for task in list(self._background_tasks):
+                task.cancel()
+            for upstream in self.upstreams.values():
+                await close_router(upstream.router)
+            self.result_store.clear()
+            logger.info(f"Gateway statistics: {self.serializer.dumps(self.stats())}")
 
 
 async def main():
@@ -228,13 +1562,16 @@ async def main():
     parser = argparse.ArgumentParser(description="MCP Voitta Gateway Server")
     parser.add_argument(
         "--config", 
-        default="config/voitta.yaml",
-        help="Path to the Voitta configuration file"
+        action="append",
+        help=(
+            "Path to a Voitta configuration file, or a directory of them; "
+            "repeat to federate several configurations (default: config/voitta.yaml)"
+        )
     )
     args = parser.parse_args()
     
     # Create and run the server
-    server = VoittaMcpServer(args.config)
+    server = VoittaMcpServer(args.config or ["config/voitta.yaml"])
     try:
         logger.info("Starting MCP Voitta Gateway Server")
         await server.run()
@@ -0,0 +1,84 @@
+"""
+Single-flight call coalescing for the MCP Voitta Gateway.
+
+Identical calls that arrive while one is already running share its result
+instead of each reaching the upstream. The shared call runs as its own task:
+a waiter that is cancelled stops waiting without affecting the others, and
+the call itself is only cancelled once nobody is waiting for it.
+"""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+logger = logging.getLogger("mcp-voitta-gateway.single_flight")
+
+
+class _Flight:
+    """A running call and the number of callers waiting for it."""
+
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls with the same key into one.
+    """
+
+    def __init__(self):
+        """Initialize with no calls in flight."""
+        self._flights: Dict[Hashable, _Flight] = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    def __len__(self) -> int:
+        return len(self._flights)
+
+    async def do(self, key: Hashable, call: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run a call, or join the identical call already in flight.
+
+        Args:
+            key: Identifies calls that may share a result.
+            call: Starts the call; only invoked if none is in flight for the key.
+
+        Returns:
+            The call's result.
+
+        Raises:
+            Exception: Whatever the shared call raised.
+        """
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = _Flight(asyncio.ensure_future(call()))
+            self._flights[key] = flight
+            flight.task.add_done_callback(lambda task: self._finish(key, flight))
+            self.calls += 1
+        else:
+            self.coalesced += 1
+
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task)
+        except asyncio.CancelledError:
+            # Only give up on the shared call when its last waiter leaves
+            if flight.waiters == 1 and not flight.task.done():
+                logger.debug(f"Cancelling call abandoned by all waiters: {key!r}")
+                # Identical calls made before the task finishes start afresh
+                if self._flights.get(key) is flight:
+                    del self._flights[key]
+                flight.task.cancel()
+            raise
+        finally:
+            flight.waiters -= 1
+
+    def _finish(self, key: Hashable, flight: _Flight):
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+        # Mark the exception retrieved in case every waiter was cancelled
+        if not flight.task.cancelled():
+            flight.task.exception()
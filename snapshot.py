@@ -0,0 +1,122 @@
+"""
+On-disk catalog snapshots for the MCP Voitta Gateway.
+
+A snapshot stores the tools discovered for a configuration so the next
+gateway process started with the same configuration can serve list_tools
+immediately, while discovery revalidates the catalog in the background.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+from typing import Any, Dict, List, Optional
+
+from gateway_config import GatewayConfig
+
+logger = logging.getLogger("mcp-voitta-gateway.snapshot")
+
+# Bump when the snapshot layout or the catalog format changes
+SNAPSHOT_VERSION = 2
+
+
+def snapshot_key(configs: List[GatewayConfig]) -> str:
+    """
+    Fingerprint the inputs that determine the catalog of a set of configurations.
+
+    Covers each configuration file and its namespace and, when MCP servers
+    are configured, the MCP settings file that defines them.
+
+    Args:
+        configs: The gateway configurations.
+
+    Returns:
+        Hex digest identifying the configurations.
+    """
+    digest = hashlib.sha256()
+    digest.update(f"v{SNAPSHOT_VERSION}:".encode("utf-8"))
+    for config in configs:
+        digest.update(f"{config.namespace}:{config.fingerprint}:".encode("utf-8"))
+
+        mcp_settings_path = (config.mcp_config or {}).get("path")
+        if mcp_settings_path:
+            try:
+                with open(os.path.expanduser(mcp_settings_path), "rb") as f:
+                    digest.update(f.read())
+            except OSError as e:
+                logger.warning(f"Cannot read MCP settings {mcp_settings_path} for snapshot key: {e}")
+
+    return digest.hexdigest()
+
+
+def snapshot_path(configs: List[GatewayConfig], directory: str) -> str:
+    """
+    Get the snapshot file path for a set of configurations.
+
+    Args:
+        configs: The gateway configurations.
+        directory: Directory holding snapshot files.
+
+    Returns:
+        Path of the snapshot file.
+    """
+    return os.path.join(directory, f"catalog-{snapshot_key(configs)[:32]}.json")
+
+
+def load_snapshot(path: str) -> Optional[List[Dict[str, Any]]]:
+    """
+    Load the tools stored in a snapshot.
+
+    Args:
+        path: Path of the snapshot file.
+
+    Returns:
+        The stored tools in Voitta format, or None if there is no usable snapshot.
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            snapshot = json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logger.warning(f"Ignoring unreadable catalog snapshot {path}: {e}")
+        return None
+
+    if not isinstance(snapshot, dict) or snapshot.get("version") != SNAPSHOT_VERSION:
+        logger.info(f"Ignoring catalog snapshot {path} with a different version")
+        return None
+
+    tools = snapshot.get("tools")
+    return tools if isinstance(tools, list) else None
+
+
+def save_snapshot(path: str, voitta_tools: List[Dict[str, Any]]):
+    """
+    Atomically write a snapshot.
+
+    Args:
+        path: Path of the snapshot file.
+        voitta_tools: The tools to store, in Voitta format.
+    """
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+
+    snapshot = {
+        "version": SNAPSHOT_VERSION,
+        "created": time.time(),
+        "tools": voitta_tools,
+    }
+
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".catalog-", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(snapshot, f, default=str)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
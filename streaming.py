@@ -0,0 +1,95 @@
+"""
+Progress reporting for the MCP Voitta Gateway.
+
+When a client asks for progress with a ``progressToken``, a call reports
+back before it completes: while the upstream call runs, progress
+notifications are sent as heartbeats saying how long the call has been
+waiting. Upstreams return complete responses, so the result itself is only
+sent once, in the final response.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Optional, Union
+
+logger = logging.getLogger("mcp-voitta-gateway.streaming")
+
+
+class ProgressStream:
+    """
+    Progress notifications for one tool call.
+    """
+
+    def __init__(
+        self,
+        session: Any,
+        progress_token: Union[str, int],
+        request_id: Any = None,
+        heartbeat_interval: float = 0,
+    ):
+        """
+        Initialize a stream.
+
+        Args:
+            session: The MCP server session of the call.
+            progress_token: The token the client sent in ``_meta.progressToken``.
+            request_id: ID of the call's request.
+            heartbeat_interval: Seconds between notifications while waiting
+                for the result, or 0 for none.
+        """
+        self.session = session
+        self.progress_token = progress_token
+        self.request_id = request_id
+        self.heartbeat_interval = heartbeat_interval
+        self.progress = 0
+
+    async def notify(self, message: Optional[str] = None, total: Optional[float] = None):
+        """
+        Send the next progress notification.
+
+        Failures are logged and ignored: progress is advisory and must not
+        fail the call.
+
+        Args:
+            message: Human-readable status shown with the progress.
+            total: Total progress expected, if known.
+        """
+        self.progress += 1
+        try:
+            await self.session.send_progress_notification(
+                self.progress_token,
+                self.progress,
+                total,
+                message,
+                related_request_id=str(self.request_id) if self.request_id is not None else None,
+            )
+        except Exception as e:
+            logger.debug(f"Could not send progress notification: {e}")
+
+    async def wait(self, awaitable: Awaitable[Any], description: str = "result") -> Any:
+        """
+        Await a result, sending heartbeats until it is ready.
+
+        Args:
+            awaitable: The call.
+            description: What is being waited for, for the heartbeat messages.
+
+        Returns:
+            The call's result.
+        """
+        if self.heartbeat_interval <= 0:
+            return await awaitable
+
+        task = asyncio.ensure_future(awaitable)
+        start = time.monotonic()
+        try:
+            while True:
+                done, _ = await asyncio.wait({task}, timeout=self.heartbeat_interval)
+                if done:
+                    return task.result()
+                await self.notify(f"Waiting for {description} ({time.monotonic() - start:.0f}s)")
+        finally:
+            if not task.done():
+                task.cancel()
+
@@ -0,0 +1,59 @@
+"""Tests for the tool catalog."""
+
+import pytest
+
+from catalog import ToolCatalog, list_page
+
+
+def voitta_tools(*names):
+    return [
+        {"function": {"name": f"1____{name}", "description": name, "parameters": {"type": "object"}}}
+        for name in names
+    ]
+
+
+def page_names(page):
+    return [tool.name for tool in page]
+
+
+def test_pages_cover_every_tool_once():
+    tools = ToolCatalog(voitta_tools("e", "a", "d", "b", "c")).mcp_tools
+
+    page, cursor = list_page(tools, None, 2)
+    assert page_names(page) == ["a", "b"]
+    page, cursor = list_page(tools, cursor, 2)
+    assert page_names(page) == ["c", "d"]
+    page, cursor = list_page(tools, cursor, 2)
+    assert page_names(page) == ["e"]
+    assert cursor is None
+
+
+def test_last_full_page_has_no_cursor():
+    tools = ToolCatalog(voitta_tools("a", "b", "c", "d")).mcp_tools
+
+    page, cursor = list_page(tools, None, 2)
+    page, cursor = list_page(tools, cursor, 2)
+    assert page_names(page) == ["c", "d"]
+    assert cursor is None
+    assert list_page(tools, None, 0) == (tools, None)
+
+
+def test_cursor_survives_catalog_swap():
+    tools = ToolCatalog(voitta_tools("a", "b", "c", "d")).mcp_tools
+    page, cursor = list_page(tools, None, 2)
+    assert page_names(page) == ["a", "b"]
+
+    # The last tool seen is gone and a new one sorts before the cursor
+    swapped = ToolCatalog(voitta_tools("a", "aa", "c", "d", "e")).mcp_tools
+    page, cursor = list_page(swapped, cursor, 2)
+    assert page_names(page) == ["c", "d"]
+    page, cursor = list_page(swapped, cursor, 2)
+    assert page_names(page) == ["e"]
+    assert cursor is None
+
+
+@pytest.mark.parametrize("cursor", ["not a cursor!", "YQ", "//8="])
+def test_malformed_cursor_is_rejected(cursor):
+    tools = ToolCatalog(voitta_tools("a", "b")).mcp_tools
+    with pytest.raises(ValueError):
+        list_page(tools, cursor, 1)
@@ -0,0 +1,43 @@
+"""Tests for the circuit breaker."""
+
+import asyncio
+
+from circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+
+
+def test_error_results_open_the_circuit():
+    async def scenario():
+        breaker = CircuitBreaker("upstream", {"min_calls": 2, "failure_rate": 0.5})
+        for _ in range(2):
+            with breaker.guard() as call:
+                call.success = False
+        breaker.close()
+        return breaker.state
+
+    assert asyncio.run(scenario()) == OPEN
+
+
+def test_error_result_of_a_probe_reopens_the_circuit():
+    async def scenario():
+        breaker = CircuitBreaker("upstream", {"min_calls": 1, "open_duration": 0})
+        with breaker.guard() as call:
+            call.success = False
+        await asyncio.sleep(0.01)
+        half_open = breaker.state
+        with breaker.guard() as call:
+            call.success = False
+        breaker.close()
+        return half_open, breaker.state
+
+    assert asyncio.run(scenario()) == (HALF_OPEN, OPEN)
+
+
+def test_successful_results_keep_the_circuit_closed():
+    async def scenario():
+        breaker = CircuitBreaker("upstream", {"min_calls": 2})
+        for _ in range(3):
+            with breaker.guard():
+                pass
+        return breaker.state, breaker.stats()["recent_calls"]
+
+    assert asyncio.run(scenario()) == (CLOSED, 3)
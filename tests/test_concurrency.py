@@ -0,0 +1,87 @@
+"""Tests for concurrency limits."""
+
+import asyncio
+
+import pytest
+
+from concurrency import ConcurrencyLimiter, OverloadedError
+
+
+def test_calls_over_the_limit_wait_for_a_slot():
+    async def scenario():
+        limiter = ConcurrencyLimiter("upstream", 1)
+        running = []
+
+        async def call(index):
+            async with limiter.slot():
+                running.append(limiter.active)
+                await asyncio.sleep(0.01)
+                return index
+
+        results = await asyncio.gather(*(call(index) for index in range(3)))
+        return limiter.stats(), running, results
+
+    stats, running, results = asyncio.run(scenario())
+    assert results == [0, 1, 2]
+    assert running == [1, 1, 1]
+    assert (stats["acquired"], stats["queued"], stats["peak_waiting"]) == (3, 2, 2)
+    assert (stats["active"], stats["waiting"]) == (0, 0)
+
+
+def test_full_queue_rejects_calls():
+    async def scenario():
+        limiter = ConcurrencyLimiter("upstream", 1, max_queue=1)
+        await limiter.acquire()
+        queued = asyncio.ensure_future(limiter.acquire())
+        await asyncio.sleep(0)
+        with pytest.raises(OverloadedError):
+            await limiter.acquire()
+        limiter.release()
+        await queued
+        limiter.release()
+        return limiter.stats()
+
+    stats = asyncio.run(scenario())
+    assert (stats["rejected"], stats["acquired"], stats["waiting"], stats["active"]) == (1, 2, 0, 0)
+
+
+def test_queue_timeout_rejects_calls():
+    async def scenario():
+        limiter = ConcurrencyLimiter("upstream", 1, queue_timeout=0.01)
+        await limiter.acquire()
+        with pytest.raises(OverloadedError):
+            await limiter.acquire()
+        return limiter.stats()
+
+    stats = asyncio.run(scenario())
+    assert (stats["timed_out"], stats["waiting"], stats["active"]) == (1, 0, 1)
+    assert stats["max_wait"] >= 0.01
+
+
+def test_cancelled_waiter_leaves_the_queue():
+    async def scenario():
+        limiter = ConcurrencyLimiter("upstream", 1, max_queue=1)
+        await limiter.acquire()
+        waiter = asyncio.ensure_future(limiter.acquire())
+        await asyncio.sleep(0)
+        assert limiter.waiting == 1
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+
+        # The freed queue place can be taken again
+        queued = asyncio.ensure_future(limiter.acquire())
+        await asyncio.sleep(0)
+        limiter.release()
+        await queued
+        return limiter.stats()
+
+    stats = asyncio.run(scenario())
+    assert (stats["waiting"], stats["active"], stats["rejected"]) == (0, 1, 0)
+
+
+def test_from_settings_needs_max_concurrent():
+    assert ConcurrencyLimiter.from_settings("upstream", {}) is None
+    limiter = ConcurrencyLimiter.from_settings("upstream", {"max_concurrent": 2, "max_queue": 4})
+    assert limiter.matches({"max_concurrent": 2, "max_queue": 4})
+    assert not limiter.matches({"max_concurrent": 3, "max_queue": 4})
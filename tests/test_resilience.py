@@ -0,0 +1,152 @@
+"""Tests for retries and hedged requests."""
+
+import asyncio
+
+import httpx
+import pytest
+
+from resilience import Resilience
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def failing_then(result, failures, error=None):
+    """Build a call that fails a number of times before returning a result."""
+    calls = []
+
+    async def call():
+        calls.append(None)
+        if len(calls) <= failures:
+            if error is not None:
+                raise error
+            return '{"status": "error", "message": "MCP server kb is not running"}'
+        return result
+
+    return call, calls
+
+
+def test_retry_returns_the_first_success():
+    resilience = Resilience()
+    call, calls = failing_then("ok", 2, httpx.ConnectError("refused"))
+    assert run(resilience.retry(call, attempts=3, backoff=0)) == "ok"
+    assert len(calls) == 3
+    assert resilience.retries == 2
+
+
+def test_retry_retries_error_results():
+    resilience = Resilience()
+    call, calls = failing_then("ok", 1)
+    assert run(resilience.retry(call, attempts=3, backoff=0)) == "ok"
+    assert len(calls) == 2
+
+
+def test_retry_stops_after_the_last_attempt():
+    resilience = Resilience()
+    call, calls = failing_then("ok", 5, httpx.ConnectError("refused"))
+    with pytest.raises(httpx.ConnectError):
+        run(resilience.retry(call, attempts=3, backoff=0))
+    assert len(calls) == 3
+
+    call, calls = failing_then("ok", 5)
+    assert run(resilience.retry(call, attempts=2, backoff=0)).startswith('{"status": "error"')
+    assert len(calls) == 2
+
+
+def test_retry_does_not_retry_other_errors():
+    resilience = Resilience()
+    call, calls = failing_then("ok", 1, ValueError("bad"))
+    with pytest.raises(ValueError):
+        run(resilience.retry(call, attempts=3, backoff=0))
+    assert len(calls) == 1
+
+
+def test_retry_backs_off_exponentially(monkeypatch):
+    delays = []
+
+    async def sleep(delay):
+        delays.append(delay)
+
+    monkeypatch.setattr(asyncio, "sleep", sleep)
+    monkeypatch.setattr("random.uniform", lambda low, high: high)
+    resilience = Resilience()
+    call, calls = failing_then("ok", 4)
+    assert run(resilience.retry(call, attempts=5, backoff=0.1, max_backoff=0.3)) == "ok"
+    assert delays == pytest.approx([0.1, 0.2, 0.3, 0.3])
+
+
+def slow_then_fast(first_result, first_delay, hedge_result, hedge_delay):
+    """Build a call whose first attempt and hedges behave differently."""
+    started = []
+
+    async def call():
+        index = len(started)
+        started.append(None)
+        try:
+            await asyncio.sleep(first_delay if index == 0 else hedge_delay)
+        except asyncio.CancelledError:
+            started[index] = "cancelled"
+            raise
+        return first_result if index == 0 else hedge_result
+
+    return call, started
+
+
+def test_hedge_wins_and_cancels_the_slow_attempt():
+    async def scenario():
+        resilience = Resilience()
+        call, started = slow_then_fast("slow", 1.0, "fast", 0.01)
+        result = await resilience.hedge(call, 0.01, max_hedges=1)
+        await asyncio.sleep(0)
+        return resilience, result, started
+
+    resilience, result, started = run(scenario())
+    assert result == "fast"
+    assert started[0] == "cancelled"
+    assert (resilience.hedges, resilience.hedge_wins) == (1, 1)
+
+
+def test_fast_error_result_does_not_beat_a_slow_success():
+    async def scenario():
+        call, _ = slow_then_fast("slow", 0.05, '{"status": "error"}', 0)
+        return await Resilience().hedge(call, 0.01, max_hedges=1)
+
+    assert run(scenario()) == "slow"
+
+
+def test_hedge_reports_failure_when_all_attempts_fail():
+    async def scenario(error):
+        attempts = []
+
+        async def call():
+            attempts.append(None)
+            await asyncio.sleep(0.05)
+            if error is not None:
+                raise error
+            return '{"status": "error"}'
+
+        try:
+            return await Resilience().hedge(call, 0.01, max_hedges=2), len(attempts)
+        except Exception as e:
+            return e, len(attempts)
+
+    result, attempts = run(scenario(None))
+    assert result == '{"status": "error"}'
+    assert attempts == 3
+
+    result, attempts = run(scenario(httpx.ReadError("reset")))
+    assert isinstance(result, httpx.ReadError)
+    assert attempts == 3
+
+
+def test_no_hedge_without_a_delay():
+    async def scenario():
+        resilience = Resilience()
+        call, started = slow_then_fast("only", 0.01, "hedge", 0)
+        return resilience, await resilience.hedge(call, None, max_hedges=2), started
+
+    resilience, result, started = run(scenario())
+    assert result == "only"
+    assert len(started) == 1
+    assert resilience.hedges == 0
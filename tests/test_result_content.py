@@ -0,0 +1,26 @@
+"""Tests for binary result recognition."""
+
+import base64
+
+from result_content import binary_payload, decoded_size, is_text_mime_type
+
+
+def test_base64_payloads_pass_through():
+    encoded = base64.b64encode(b"\x89PNG\r\n\x1a\n" + bytes(10)).decode("ascii")
+    assert binary_payload({"data": encoded, "mimeType": "image/png"}) == (encoded, "image/png")
+    assert decoded_size(encoded) == 18
+
+
+def test_bytes_are_sniffed():
+    assert binary_payload(b"%PDF-1.7") == (b"%PDF-1.7", "application/pdf")
+
+
+def test_text_that_is_not_base64_is_not_binary():
+    assert binary_payload({"data": '{"a": 1}', "mimeType": "application/octet-stream"}) is None
+
+
+def test_textual_mime_types_are_not_binary():
+    assert binary_payload({"data": "eyJhIjogMX0=", "mimeType": "application/json"}) is None
+    assert binary_payload({"data": b"<a/>", "content_type": "application/atom+xml; charset=utf-8"}) is None
+    assert is_text_mime_type("text/csv")
+    assert not is_text_mime_type("image/png")
@@ -0,0 +1,22 @@
+"""Tests for the spilled result store."""
+
+import asyncio
+
+from result_store import ResultStore
+
+
+def test_put_and_read_pages():
+    async def scenario():
+        store = ResultStore()
+        try:
+            results = await asyncio.gather(*(store.put(b"line\n" * 1000) for _ in range(3)))
+            _, text, meta = store.read(results[0].uri + "?lines=2-3")
+            return results, len(store), text, meta
+        finally:
+            store.clear()
+
+    results, stored, text, meta = asyncio.run(scenario())
+    assert results[0] is results[1] is results[2]
+    assert stored == 1
+    assert text == "line\nline\n"
+    assert meta is not None
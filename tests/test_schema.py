@@ -0,0 +1,41 @@
+"""Tests for schema normalization."""
+
+from schema import SchemaNormalizer
+
+PARAMETERS = {
+    "type": "object",
+    "properties": {"query": {"type": "string", "description": "Search query"}},
+    "required": ["query"],
+}
+
+
+def test_identical_parameters_share_one_schema():
+    normalizer = SchemaNormalizer()
+    first = normalizer.normalize(dict(PARAMETERS))
+    second = normalizer.normalize(dict(reversed(list(PARAMETERS.items()))))
+    assert first is second
+    assert normalizer.cache_info()["hits"] == 1
+
+
+def test_schemas_are_reused_from_the_previous_normalizer():
+    previous = SchemaNormalizer()
+    schema = previous.normalize(PARAMETERS)
+    minimal = previous.minimize(schema)
+
+    normalizer = SchemaNormalizer(previous)
+    assert normalizer.normalize(PARAMETERS) is schema
+    assert normalizer.minimize(schema) is minimal
+    assert normalizer.cache_info()["misses"] == 0
+
+
+def test_detached_normalizer_keeps_only_its_own_schemas():
+    previous = SchemaNormalizer()
+    previous.normalize({"type": "object", "properties": {"unused": {"type": "integer"}}})
+    schema = previous.normalize(PARAMETERS)
+
+    normalizer = SchemaNormalizer(previous)
+    assert normalizer.normalize(PARAMETERS) is schema
+    normalizer.detach()
+    assert normalizer.cache_info()["normalized"] == 1
+    assert normalizer.normalize({"type": "object", "properties": {"unused": {"type": "integer"}}}) is not None
+    assert normalizer.cache_info()["misses"] == 1
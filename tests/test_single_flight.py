@@ -0,0 +1,89 @@
+"""Tests for single-flight call coalescing."""
+
+import asyncio
+
+import pytest
+
+from single_flight import SingleFlight
+
+
+def test_concurrent_calls_share_one_call():
+    async def scenario():
+        flights = SingleFlight()
+        started = 0
+
+        async def call():
+            nonlocal started
+            started += 1
+            await asyncio.sleep(0.01)
+            return "result"
+
+        results = await asyncio.gather(*(flights.do("key", call) for _ in range(5)))
+        return flights, started, results
+
+    flights, started, results = asyncio.run(scenario())
+    assert results == ["result"] * 5
+    assert started == 1
+    assert (flights.calls, flights.coalesced, len(flights)) == (1, 4, 0)
+
+
+def test_errors_are_shared():
+    async def scenario():
+        flights = SingleFlight()
+
+        async def call():
+            await asyncio.sleep(0.01)
+            raise ValueError("failed")
+
+        return await asyncio.gather(*(flights.do("key", call) for _ in range(2)), return_exceptions=True)
+
+    results = asyncio.run(scenario())
+    assert [type(result) for result in results] == [ValueError, ValueError]
+
+
+def test_cancelled_waiter_does_not_cancel_others():
+    async def scenario():
+        flights = SingleFlight()
+        release = asyncio.Event()
+
+        async def call():
+            await release.wait()
+            return "result"
+
+        first = asyncio.ensure_future(flights.do("key", call))
+        second = asyncio.ensure_future(flights.do("key", call))
+        await asyncio.sleep(0)
+        first.cancel()
+        await asyncio.sleep(0)
+        release.set()
+        return first, await second
+
+    first, result = asyncio.run(scenario())
+    assert first.cancelled()
+    assert result == "result"
+
+
+def test_call_after_last_waiter_cancelled_starts_afresh():
+    async def scenario():
+        flights = SingleFlight()
+        started = 0
+
+        async def call():
+            nonlocal started
+            started += 1
+            await asyncio.sleep(0.01)
+            return started
+
+        abandoned = asyncio.ensure_future(flights.do("key", call))
+        await asyncio.sleep(0)
+        abandoned.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await abandoned
+
+        # The abandoned call's task has not finished yet
+        assert len(flights) == 0
+        return await flights.do("key", call), started
+
+    result, started = asyncio.run(scenario())
+    assert result == 2
+    assert started == 2
@@ -0,0 +1,70 @@
+"""Tests for tool argument validation."""
+
+from validation import OFF, STRUCTURAL, compile_schema, validate_arguments
+
+
+def errors(schema, arguments):
+    return validate_arguments(compile_schema(schema), arguments)
+
+
+def test_permissive_schemas_compile_to_nothing():
+    assert compile_schema(True) is None
+    assert compile_schema({}) is None
+
+
+def test_reports_paths_and_messages():
+    schema = {
+        "type": "object",
+        "properties": {"items": {"type": "array", "items": {"type": "integer"}}},
+        "required": ["query"],
+    }
+    result = errors(schema, {"items": [1, "two"]})
+    assert {error["path"] for error in result} == {"$", "items[1]"}
+    assert errors(schema, {"query": "x", "items": [1, 2]}) is None
+
+
+def test_false_subschemas_reject_values():
+    assert errors(False, {}) is not None
+    schema = {"type": "object", "properties": {"a": {"type": "string"}}, "additionalProperties": False}
+    assert errors(schema, {"a": "x"}) is None
+    assert errors(schema, {"a": "x", "b": 1})[0]["path"] == "$"
+    assert errors({"type": "object", "properties": {"a": False}}, {"a": 1}) is not None
+    assert errors({"type": "array", "items": False}, [1]) is not None
+
+
+def test_openapi_dialect():
+    assert errors({"type": "string", "nullable": True}, None) is None
+    assert errors({"type": "string"}, None) is not None
+    assert errors({"type": "number", "minimum": 0, "exclusiveMinimum": True}, 0) is not None
+    assert errors({"type": "number", "minimum": 0, "exclusiveMinimum": True}, 0.5) is None
+    assert errors({"type": "number", "maximum": 10, "exclusiveMaximum": True}, 10) is not None
+    assert errors({"type": "number", "maximum": 10, "exclusiveMaximum": False}, 10) is None
+
+
+def test_unevaluable_schemas_let_calls_through():
+    assert errors({"$ref": "https://example.invalid/schema.json"}, 1) is None
+    assert errors({"type": "string", "pattern": "("}, "x") is None
+
+
+def test_structural_mode_checks_only_object_structure():
+    # Voitta turns MCP array items and untyped parameters into strings
+    schema = {
+        "type": "object",
+        "properties": {"ids": {"type": "array", "items": {"type": "string"}}, "limit": {"type": "string"}},
+        "required": ["ids"],
+    }
+    validator = compile_schema(schema, STRUCTURAL)
+    assert validate_arguments(validator, {"ids": [1, 2], "limit": 5}) is None
+    assert validate_arguments(validator, {"limit": 5})[0]["path"] == "$"
+    assert validate_arguments(validator, []) is not None
+
+
+def test_structural_mode_keeps_additional_properties():
+    schema = {"type": "object", "properties": {"a": {"type": "integer"}}, "additionalProperties": False}
+    validator = compile_schema(schema, STRUCTURAL)
+    assert validate_arguments(validator, {"a": "x"}) is None
+    assert validate_arguments(validator, {"b": 1}) is not None
+
+
+def test_validation_can_be_disabled():
+    assert compile_schema({"type": "object", "required": ["a"]}, OFF) is None
@@ -0,0 +1,138 @@
+"""
+Tool filtering for the MCP Voitta Gateway.
+
+Allow and deny rules from the ``gateway.tools`` section decide which
+upstream tools make it into the catalog. Filtered tools are dropped before
+the catalog is built, so they are never normalized, indexed, listed or
+resolvable.
+
+A rule is either a pattern matched against the function name or the full
+tool name, or a mapping with ``namespace`` and/or ``name`` patterns.
+``namespace`` matches the tool namespace (``1``, ``mcp``) or the upstream
+name (the endpoint name, or ``mcp:<server>``). Patterns are globs, or
+regular expressions when prefixed with ``re:``.
+"""
+
+import fnmatch
+import re
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+Matcher = Callable[[str], bool]
+
+
+def compile_pattern(pattern: str) -> Matcher:
+    """
+    Compile a glob or ``re:`` pattern into a matcher.
+
+    Args:
+        pattern: The pattern.
+
+    Returns:
+        Function testing whether a string matches the whole pattern.
+
+    Raises:
+        ValueError: If a regular expression is invalid.
+    """
+    pattern = str(pattern)
+    if pattern.startswith("re:"):
+        expression = pattern[3:]
+    else:
+        expression = fnmatch.translate(pattern)
+
+    try:
+        regex = re.compile(expression)
+    except re.error as e:
+        raise ValueError(f"Invalid tool filter pattern {pattern!r}: {e}") from e
+    return lambda text: regex.fullmatch(text) is not None
+
+
+class ToolRule:
+    """
+    A single allow or deny rule.
+    """
+
+    def __init__(self, rule: Any):
+        """
+        Compile a rule.
+
+        Args:
+            rule: A pattern, or a mapping with ``namespace`` and/or ``name`` patterns.
+
+        Raises:
+            ValueError: If the rule is malformed.
+        """
+        self.rule = rule
+        self.namespace: Optional[Matcher] = None
+        self.name: Optional[Matcher] = None
+        self.any_name: Optional[Matcher] = None
+
+        if isinstance(rule, dict):
+            unknown = set(rule) - {"namespace", "name"}
+            if unknown or not rule:
+                raise ValueError(f"Tool filter rule {rule!r} must have only 'namespace' and 'name' keys")
+            if "namespace" in rule:
+                self.namespace = compile_pattern(rule["namespace"])
+            if "name" in rule:
+                self.name = compile_pattern(rule["name"])
+        else:
+            self.any_name = compile_pattern(rule)
+
+    def matches(self, namespaces: Sequence[str], name: str, full_name: str) -> bool:
+        """
+        Test whether the rule matches a tool.
+
+        Args:
+            namespaces: The namespaces the tool is known under, including its upstream name.
+            name: The function name.
+            full_name: The full tool name.
+
+        Returns:
+            True if the rule matches.
+        """
+        if self.any_name is not None:
+            return self.any_name(name) or self.any_name(full_name)
+        if self.namespace is not None and not any(self.namespace(namespace) for namespace in namespaces):
+            return False
+        return self.name is None or self.name(name)
+
+
+class ToolFilter:
+    """
+    Allow and deny rules for a configuration's tools.
+
+    With no allow rules every tool is allowed; deny rules take precedence
+    over allow rules.
+    """
+
+    def __init__(self, settings: Optional[Dict[str, Any]] = None):
+        """
+        Compile the rules of a ``gateway.tools`` section.
+
+        Args:
+            settings: Mapping with optional ``allow`` and ``deny`` rule lists.
+
+        Raises:
+            ValueError: If a rule is malformed.
+        """
+        settings = settings or {}
+        self.allow: List[ToolRule] = [ToolRule(rule) for rule in settings.get("allow") or []]
+        self.deny: List[ToolRule] = [ToolRule(rule) for rule in settings.get("deny") or []]
+
+    def __bool__(self) -> bool:
+        return bool(self.allow or self.deny)
+
+    def allows(self, namespaces: Sequence[str], name: str, full_name: str) -> bool:
+        """
+        Decide whether a tool is exposed.
+
+        Args:
+            namespaces: The namespaces the tool is known under, including its upstream name.
+            name: The function name.
+            full_name: The full tool name.
+
+        Returns:
+            True if the tool passes the filter.
+        """
+        if self.allow and not any(rule.matches(namespaces, name, full_name) for rule in self.allow):
+            return False
+        return not any(rule.matches(namespaces, name, full_name) for rule in self.deny)
@@ -0,0 +1,353 @@
+"""
+Upstreams for the MCP Voitta Gateway.
+
+An upstream is one independently discovered source of tools: an OpenAPI
+endpoint, the canvas, or a single MCP server. Each upstream gets its own
+VoittaRouter, so a slow or failing upstream does not hold up or break the
+others.
+
+Tools are exposed under the names a single VoittaRouter built from the whole
+configuration would use: OpenAPI endpoints are numbered by their position in
+the configuration, the canvas uses ``0`` and MCP servers use ``mcp``. When
+several configurations are federated, each namespace is prefixed with the
+configuration's namespace (``kb_1____search``).
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from voitta import VoittaRouter
+
+from catalog import TOOL_DELIMITER
+from circuit_breaker import CircuitBreaker
+from concurrency import ConcurrencyLimiter
+from gateway_config import GatewayConfig, ToolPolicy, close_router, create_router
+from schema import structural_key
+from validation import FULL, STRUCTURAL
+
+logger = logging.getLogger("mcp-voitta-gateway.upstreams")
+
+
+class Upstream:
+    """
+    A source of tools with its own router and discovery lifecycle.
+    """
+
+    def __init__(
+        self,
+        config: GatewayConfig,
+        name: str,
+        namespace: str,
+        endpoints: List[Tuple[str, Dict[str, Any]]],
+        mcp_server: Optional[str] = None,
+        mcp_server_settings: Optional[Dict[str, Any]] = None,
+    ):
+        """
+        Initialize an upstream.
+
+        Args:
+            config: The configuration the upstream is defined in.
+            name: Upstream name within its configuration (the endpoint name,
+                ``mcp`` or ``mcp:<server>``).
+            namespace: Namespace of its tools as a single router over the
+                configuration would name it (a number, ``0`` or ``mcp``).
+            endpoints: Endpoint configuration for its router, ending with the
+                upstream's own endpoint. It may also include the reference
+                provider, which Voitta uses to dereference arguments.
+            mcp_server: Restrict the router to this MCP server.
+            mcp_server_settings: The server's entry in the MCP settings file,
+                so changes to it are noticed on reload.
+        """
+        self.config = config
+        self.router_namespace = namespace
+        self.endpoints = endpoints
+        self.mcp_config = config.mcp_config if namespace == "mcp" else None
+        self.mcp_server = mcp_server
+
+        # Federated configurations prefix their upstreams and tool namespaces
+        self.short_name = name
+        if config.namespace:
+            self.name = f"{config.namespace}:{name}"
+            self.namespace = f"{config.namespace}_{namespace}"
+        else:
+            self.name = name
+            self.namespace = namespace
+
+        # Everything that determines what the upstream's router discovers
+        self.source = structural_key([
+            self.namespace, endpoints, self.mcp_config, mcp_server, mcp_server_settings, config.get("tools"),
+        ])
+        # Short form of the source, separating cached results of different backends
+        self.source_digest = hashlib.sha256(self.source).digest()
+
+        # Current router, and its tools in gateway naming (None until discovered)
+        self.router: Optional[VoittaRouter] = None
+        self.tools: Optional[List[Dict[str, Any]]] = None
+
+        # Limits calls to the upstream as a whole
+        self.limiter = ConcurrencyLimiter.from_settings(self.name, config.get("concurrency", {}))
+
+        # Fails calls fast while the upstream is unhealthy; on_breaker_change
+        # is called with the upstream, old and new state on transitions
+        self.on_breaker_change: Optional[Callable[["Upstream", str, str], None]] = None
+        self.breaker = self.create_breaker(config.get("circuit_breaker", {}))
+
+        # Consecutive failed discoveries, drives the retry backoff
+        self.failures = 0
+        self.retry_task: Optional[asyncio.Task] = None
+
+        # Set once a configuration reload has dropped the upstream
+        self.retired = False
+
+    def __repr__(self) -> str:
+        return f"Upstream({self.name!r})"
+
+    def create_router(self) -> VoittaRouter:
+        """
+        Create a router for this upstream. Blocking; run it in a worker thread.
+
+        Returns:
+            The new router. MCP tools still need to be discovered.
+        """
+        voitta_router = create_router(self.endpoints, self.mcp_config)
+        if self.mcp_server is not None and voitta_router.mcp is not None:
+            voitta_router.mcp.servers = {
+                name: server for name, server in voitta_router.mcp.servers.items() if name == self.mcp_server
+            }
+        return voitta_router
+
+    async def discover(self) -> Tuple[VoittaRouter, List[Dict[str, Any]]]:
+        """
+        Create a router and discover this upstream's tools.
+
+        Returns:
+            Tuple of the new router and its tools in gateway naming.
+
+        Raises:
+            RuntimeError: If the endpoint or MCP server could not be loaded.
+        """
+        voitta_router = await asyncio.to_thread(self.create_router)
+        try:
+            await voitta_router.discover_mcp_tools()
+
+            if self.mcp_server is not None:
+                process = voitta_router.mcp.server_processes.get(self.mcp_server)
+                if process is None or not process.is_running():
+                    raise RuntimeError(f"MCP server {self.mcp_server} failed to start")
+
+            tools = self.collect_tools(voitta_router)
+        except BaseException:
+            await close_router(voitta_router)
+            raise
+        return voitta_router, tools
+
+    def reconfigure(self, config: GatewayConfig):
+        """
+        Adopt a reloaded configuration that defines the upstream identically.
+
+        Args:
+            config: The reloaded configuration.
+        """
+        self.config = config
+        settings = config.get("concurrency", {})
+        if self.limiter is None or not self.limiter.matches(settings):
+            # Calls holding a slot of the old limiter release it there
+            self.limiter = ConcurrencyLimiter.from_settings(self.name, settings)
+
+        breaker_settings = config.get("circuit_breaker", {})
+        if (self.breaker.settings if self.breaker is not None else {}) != breaker_settings:
+            if self.breaker is not None:
+                self.breaker.close()
+            self.breaker = self.create_breaker(breaker_settings)
+
+    def create_breaker(self, settings: Dict[str, Any]) -> Optional[CircuitBreaker]:
+        """
+        Create the upstream's circuit breaker.
+
+        Args:
+            settings: The ``circuit_breaker`` configuration block.
+
+        Returns:
+            The breaker, or None if circuit breaking is not enabled.
+        """
+        if not settings.get("enabled", False):
+            return None
+
+        def changed(previous: str, state: str):
+            if self.on_breaker_change is not None:
+                self.on_breaker_change(self, previous, state)
+
+        return CircuitBreaker(self.name, settings, changed)
+
+    @property
+    def namespaces(self) -> Tuple[str, ...]:
+        """Names tool rules can match this upstream's tools' namespace by."""
+        return (self.namespace, self.router_namespace, self.short_name, self.name)
+
+    @property
+    def validation_mode(self) -> str:
+        """
+        How thoroughly call arguments for this upstream's tools are validated.
+
+        Voitta rewrites MCP tool schemas, so for MCP servers at most their
+        structure is checked.
+        """
+        mode = self.config.argument_validation
+        if mode == FULL and self.router_namespace == "mcp":
+            return STRUCTURAL
+        return mode
+
+    def tool_policy(self, function_name: str, full_name: str) -> ToolPolicy:
+        """
+        Get the call policy of one of this upstream's tools.
+
+        Args:
+            function_name: The function name.
+            full_name: The full tool name.
+
+        Returns:
+            The tool's policy under the upstream's configuration.
+        """
+        return self.config.tool_policy(self.namespaces, function_name, full_name)
+
+    def local_namespace(self, voitta_router: VoittaRouter) -> str:
+        """
+        Get the namespace this upstream's tools have inside its router.
+
+        Args:
+            voitta_router: A router created by this upstream.
+
+        Returns:
+            The router-local namespace.
+
+        Raises:
+            RuntimeError: If the upstream's endpoint failed to load.
+        """
+        if self.router_namespace in ("0", "mcp"):
+            return self.router_namespace
+
+        endpoint_name = self.endpoints[-1][0]
+        for index, endpoint in enumerate(voitta_router.endpoints):
+            if endpoint.name == endpoint_name:
+                return str(index + 1)
+        raise RuntimeError(f"Endpoint {endpoint_name} could not be loaded")
+
+    def collect_tools(self, voitta_router: VoittaRouter) -> List[Dict[str, Any]]:
+        """
+        Get this upstream's tools from a router, renamed into gateway naming.
+
+        Args:
+            voitta_router: A router created by this upstream.
+
+        Tools rejected by the configuration's tool filter are left out.
+
+        Returns:
+            Tools in Voitta format, each tagged with the upstream name.
+        """
+        local_namespace = self.local_namespace(voitta_router)
+        tool_filter = self.config.tool_filter
+        namespaces = self.namespaces
+        tools = []
+        filtered = 0
+        for tool in voitta_router.get_tools():
+            function_info = tool.get("function", {})
+            namespace, _, function_name = function_info.get("name", "").partition(TOOL_DELIMITER)
+            if namespace != local_namespace:
+                continue
+
+            full_name = f"{self.namespace}{TOOL_DELIMITER}{function_name}"
+            if tool_filter and not tool_filter.allows(namespaces, function_name, full_name):
+                filtered += 1
+                continue
+
+            tools.append({
+                **tool,
+                "function": {**function_info, "name": full_name},
+                "upstream": self.name,
+            })
+
+        if filtered:
+            logger.info(f"Upstream {self.name}: {filtered} tools filtered out, {len(tools)} kept")
+        return tools
+
+    def local_name(self, voitta_router: VoittaRouter, full_name: str) -> str:
+        """
+        Translate a gateway tool name to the name the router expects.
+
+        Args:
+            voitta_router: The router that will handle the call.
+            full_name: The gateway's full tool name.
+
+        Returns:
+            The router-local function name.
+        """
+        function_name = full_name.partition(TOOL_DELIMITER)[2]
+        return f"{self.local_namespace(voitta_router)}{TOOL_DELIMITER}{function_name}"
+
+
+def mcp_servers(mcp_config: Dict[str, Any]) -> Optional[Dict[str, Dict[str, Any]]]:
+    """
+    Get the enabled servers of an MCP configuration.
+
+    Args:
+        mcp_config: The ``mcp_config`` section of the Voitta configuration.
+
+    Returns:
+        Server settings by name, or None if the settings file cannot be split
+        per server.
+    """
+    if mcp_config.get("type", "cline") != "cline" or not mcp_config.get("path"):
+        return None
+
+    try:
+        with open(os.path.expanduser(mcp_config["path"]), "r") as f:
+            settings = json.load(f)
+    except (OSError, ValueError) as e:
+        logger.warning(f"Cannot read MCP settings {mcp_config['path']}: {e}")
+        return None
+
+    servers = settings.get("mcpServers", {})
+    return {name: server for name, server in servers.items() if not server.get("disabled", False)}
+
+
+def upstreams_from_config(config: GatewayConfig) -> List[Upstream]:
+    """
+    Split a configuration into independently discovered upstreams.
+
+    Args:
+        config: The gateway configuration.
+
+    Returns:
+        Upstreams in the order a single router would list their tools.
+    """
+    reference_providers = [
+        (name, info) for name, info in config.endpoints
+        if info.get("role", None) == "reference_provider"
+    ]
+
+    upstreams = []
+    canvas = []
+    position = 0
+    for name, info in config.endpoints:
+        endpoints = [endpoint for endpoint in reference_providers if endpoint[0] != name]
+        endpoints.append((name, info))
+        if info.get("url") == "canvas":
+            canvas.append(Upstream(config, name, "0", endpoints))
+        else:
+            position += 1
+            upstreams.append(Upstream(config, name, str(position), endpoints))
+    upstreams.extend(canvas)
+
+    if config.mcp_config:
+        servers = mcp_servers(config.mcp_config)
+        if servers is None:
+            upstreams.append(Upstream(config, "mcp", "mcp", []))
+        else:
+            for server_name, server_settings in servers.items():
+                upstreams.append(Upstream(config, f"mcp:{server_name}", "mcp", [], server_name, server_settings))
+
+    return upstreams
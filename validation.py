@@ -0,0 +1,179 @@
+"""
+Argument validation for the MCP Voitta Gateway.
+
+Tool input schemas are compiled once into ``jsonschema`` validators, so
+arguments can be checked before a call is dispatched and invalid calls are
+answered without an upstream round trip.
+
+Voitta rebuilds upstream schemas lossily (array items become strings,
+untyped and ``anyOf`` parameters get a single type), so by default only
+the structure of the arguments is checked: that they form an object with
+the required properties and no unknown ones where the schema forbids them.
+Full validation is opt-in.
+
+The validators follow the schema's ``$schema`` draft, defaulting to the
+latest, and understand the OpenAPI ``nullable`` flag and draft 4 boolean
+exclusive bounds found in OpenAPI descriptions. ``format`` is not checked,
+and a schema that cannot be evaluated, such as one with an unresolvable
+``$ref``, lets the call through rather than rejecting valid calls.
+"""
+
+import logging
+from typing import Any, Dict, Iterator, List, Optional, Type
+
+from jsonschema import validators
+from jsonschema.exceptions import ValidationError
+from jsonschema.protocols import Validator
+
+logger = logging.getLogger("mcp-voitta-gateway.validation")
+
+# Maximum number of errors reported for one call
+MAX_ERRORS = 10
+
+# Validation modes: no checks, object structure only, or the whole schema
+OFF = "off"
+STRUCTURAL = "structural"
+FULL = "full"
+VALIDATION_MODES = (OFF, STRUCTURAL, FULL)
+
+# Validator classes extended for OpenAPI schemas, by the class they extend
+_extended: Dict[Type[Validator], Type[Validator]] = {}
+
+
+def _openapi_validator(base: Type[Validator]) -> Type[Validator]:
+    """
+    Extend a validator class with the OpenAPI dialect of JSON Schema.
+
+    Args:
+        base: The validator class for the schema's draft.
+
+    Returns:
+        The extended class, created once per base class.
+    """
+    extended = _extended.get(base)
+    if extended is not None:
+        return extended
+
+    check_type = base.VALIDATORS.get("type")
+    check_minimum = base.VALIDATORS.get("exclusiveMinimum")
+    check_maximum = base.VALIDATORS.get("exclusiveMaximum")
+
+    def type_or_null(validator, types, instance, schema) -> Iterator[ValidationError]:
+        if instance is None and schema.get("nullable") is True:
+            return
+        yield from check_type(validator, types, instance, schema)
+
+    def exclusive_bound(check, keyword, excluded, relation):
+        # Draft 4 boolean exclusive bounds make minimum/maximum strict
+        def exclusive(validator, bound, instance, schema) -> Iterator[ValidationError]:
+            if not isinstance(bound, bool):
+                yield from check(validator, bound, instance, schema)
+                return
+            limit = schema.get(keyword)
+            if (
+                bound
+                and validator.is_type(instance, "number")
+                and validator.is_type(limit, "number")
+                and excluded(instance, limit)
+            ):
+                yield ValidationError(f"{instance!r} is {relation} the {keyword} of {limit!r}")
+        return exclusive
+
+    overrides = {}
+    if check_type is not None:
+        overrides["type"] = type_or_null
+    if check_minimum is not None:
+        overrides["exclusiveMinimum"] = exclusive_bound(
+            check_minimum, "minimum", lambda value, limit: value <= limit, "less than or equal to"
+        )
+    if check_maximum is not None:
+        overrides["exclusiveMaximum"] = exclusive_bound(
+            check_maximum, "maximum", lambda value, limit: value >= limit, "greater than or equal to"
+        )
+
+    extended = _extended[base] = validators.extend(base, overrides)
+    return extended
+
+
+def structural_schema(schema: Any) -> Any:
+    """
+    Reduce a schema to the structure of the object it describes.
+
+    Args:
+        schema: A tool's input schema.
+
+    Returns:
+        Schema checking only the object type, required properties and,
+        where the schema forbids them, unknown properties.
+    """
+    if not isinstance(schema, dict):
+        return schema
+
+    structural: Dict[str, Any] = {}
+    if schema.get("type") == "object":
+        structural["type"] = "object"
+    if isinstance(schema.get("required"), list) and schema["required"]:
+        structural["required"] = list(schema["required"])
+    if schema.get("additionalProperties") is False:
+        structural["additionalProperties"] = False
+        for keyword in ("properties", "patternProperties"):
+            if isinstance(schema.get(keyword), dict):
+                structural[keyword] = {name: True for name in schema[keyword]}
+    return structural
+
+
+def compile_schema(schema: Any, mode: str = FULL) -> Optional[Validator]:
+    """
+    Compile a JSON Schema into a validator.
+
+    Args:
+        schema: The schema.
+        mode: How much of the schema to check, one of ``VALIDATION_MODES``.
+
+    Returns:
+        The validator, or None if the schema accepts every value.
+    """
+    if mode == OFF:
+        return None
+    if mode == STRUCTURAL:
+        schema = structural_schema(schema)
+    if schema is not False and (not isinstance(schema, dict) or not schema):
+        return None
+    return _openapi_validator(validators.validator_for(schema))(schema)
+
+
+def _join(path: str, key: Any) -> str:
+    if isinstance(key, int):
+        return f"{path}[{key}]"
+    return f"{path}.{key}" if path else str(key)
+
+
+def validate_arguments(validator: Optional[Validator], arguments: Any) -> Optional[List[Dict[str, str]]]:
+    """
+    Validate call arguments.
+
+    Args:
+        validator: The tool's compiled validator, or None if it accepts anything.
+        arguments: The arguments sent by the client.
+
+    Returns:
+        None if the arguments are valid, otherwise a list of errors, each with
+        the ``path`` of the offending value and a ``message``.
+    """
+    if validator is None:
+        return None
+
+    errors = []
+    try:
+        for error in validator.iter_errors(arguments):
+            path = ""
+            for key in error.absolute_path:
+                path = _join(path, key)
+            errors.append({"path": path or "$", "message": error.message})
+            if len(errors) >= MAX_ERRORS:
+                break
+    except Exception as e:
+        # A schema the validator cannot evaluate must not block the call
+        logger.debug(f"Skipping argument validation: {e}")
+        return None
+    return errors or None